@@ -0,0 +1,235 @@
+"""
+Execute the Python scripts cell by cell and record their resource usage.
+
+Each script is split into cells the same way jupytext does when creating the
+notebooks, then executed in a fresh Python process from the scripts folder.
+For each code cell, we record the wall time, the CPU time (including the
+worker processes that have terminated, e.g. the joblib workers) and the peak
+resident memory reached while running it.
+
+The results of each run are written to a JSON file named after the date of
+the run. When a baseline result file is given, a report comparing both runs
+is printed.
+
+Usage:
+    python build_tools/benchmark-notebooks.py python_scripts \
+        --baseline benchmark-results/<date of a previous run>.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# execution timeout used by jupyter-book, see jupyter-book/_config.yml
+BOOK_TIMEOUT = 300
+
+
+def _peak_rss_reset():
+    """Reset the peak resident memory of the process, if supported.
+
+    Writing 5 to `/proc/self/clear_refs` resets `VmHWM` on Linux. On other
+    platforms, the peak is the one of the whole process lifetime.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss():
+    """Peak resident memory of the process in bytes."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_time():
+    usage = [resource.getrusage(who) for who in
+             (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+
+def run_script(script_path):
+    """Execute a script cell by cell and return the timing of each cell.
+
+    This function is meant to be called in a fresh process whose working
+    directory is the folder of the script.
+    """
+    import jupytext
+
+    # notebook kernels can import modules from their working directory
+    sys.path.insert(0, os.getcwd())
+    notebook = jupytext.read(script_path)
+    namespace = {"__name__": "__main__"}
+    cells = []
+    for cell_index, cell in enumerate(notebook.cells):
+        if cell.cell_type != "code":
+            continue
+        # drop the IPython magics such as `%%time`: they only print timings
+        source = "\n".join(line for line in cell.source.split("\n")
+                            if not line.lstrip().startswith("%"))
+        code = compile(source, f"<{script_path.name} cell {cell_index}>",
+                       "exec")
+        _peak_rss_reset()
+        start_wall, start_cpu = time.perf_counter(), _cpu_time()
+        error = None
+        try:
+            exec(code, namespace)
+        except Exception:
+            error = traceback.format_exc()
+        cells.append({
+            "cell_index": cell_index,
+            "first_line": cell.source.strip().split("\n")[0],
+            "wall_time": time.perf_counter() - start_wall,
+            "cpu_time": _cpu_time() - start_cpu,
+            "peak_rss": _peak_rss(),
+            "error": error,
+        })
+        # the inline backend of the notebooks closes the figures after each
+        # cell: do the same to get a comparable memory usage
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close("all")
+        if error is not None:
+            break
+    return cells
+
+
+def benchmark(scripts_dir, pattern="*.py"):
+    """Run each script of `scripts_dir` in its own process."""
+    env = dict(os.environ, MPLBACKEND="Agg", PLOTLY_RENDERER="json")
+    results = {}
+    for script_path in sorted(Path(scripts_dir).glob(pattern)):
+        print(f"Running {script_path}", flush=True)
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-one",
+             script_path.name],
+            cwd=script_path.parent, env=env, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, universal_newlines=True,
+        )
+        # the cell timings are the last line printed by the child process
+        output = process.stdout.strip().split("\n")[-1]
+        try:
+            cells = json.loads(output)
+        except ValueError:
+            cells = [{"cell_index": None, "first_line": "", "wall_time": 0.,
+                      "cpu_time": 0., "peak_rss": 0,
+                      "error": f"process exited with code "
+                               f"{process.returncode}"}]
+        results[script_path.stem] = {
+            "wall_time": sum(cell["wall_time"] for cell in cells),
+            "cpu_time": sum(cell["cpu_time"] for cell in cells),
+            # a script without code cells, e.g. a take-away, has no timings
+            "peak_rss": max((cell["peak_rss"] for cell in cells), default=0),
+            "failed": any(cell["error"] is not None for cell in cells),
+            "cells": cells,
+        }
+    return results
+
+
+def _format_ratio(current, reference):
+    if not reference:
+        return "   n/a"
+    return f"{current / reference:6.2f}"
+
+
+def report(results, baseline=None, n_slowest_cells=10):
+    """Print a summary of a run, compared to a baseline run if given."""
+    notebooks = results["notebooks"]
+    reference = baseline["notebooks"] if baseline is not None else {}
+    header = (f"{'notebook':<45} {'wall (s)':>9} {'cpu (s)':>9} "
+              f"{'peak MB':>8}")
+    if baseline is not None:
+        header += f" {'wall x':>6} {'mem x':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, result in sorted(notebooks.items(),
+                               key=lambda item: -item[1]["wall_time"]):
+        line = (f"{name:<45} {result['wall_time']:9.2f} "
+                f"{result['cpu_time']:9.2f} {result['peak_rss'] / 1e6:8.0f}")
+        if baseline is not None:
+            ref = reference.get(name, {})
+            wall_ratio = _format_ratio(result["wall_time"],
+                                       ref.get("wall_time"))
+            mem_ratio = _format_ratio(result["peak_rss"], ref.get("peak_rss"))
+            line += f" {wall_ratio} {mem_ratio}"
+        if result["failed"]:
+            line += "  FAILED"
+        elif result["wall_time"] > 0.8 * BOOK_TIMEOUT:
+            line += "  close to the jupyter-book timeout"
+        print(line)
+
+    print(f"\nTotal wall time: "
+          f"{sum(r['wall_time'] for r in notebooks.values()):.1f} s")
+    if baseline is not None:
+        print(f"Baseline total wall time: "
+              f"{sum(r['wall_time'] for r in reference.values()):.1f} s")
+
+    for name, result in sorted(notebooks.items()):
+        if result["failed"]:
+            error = result["cells"][-1]["error"].strip().split("\n")[-1]
+            print(f"\n{name} failed: {error}")
+
+    cells = [(cell["wall_time"], name, cell)
+             for name, result in notebooks.items()
+             for cell in result["cells"]]
+    print(f"\n{n_slowest_cells} slowest cells:")
+    for wall_time, name, cell in sorted(cells, key=lambda c: -c[0])[
+            :n_slowest_cells]:
+        print(f"{wall_time:9.2f} s  {name} [cell {cell['cell_index']}] "
+              f"{cell['first_line'][:50]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scripts_dir", nargs="?", default="python_scripts")
+    parser.add_argument("--pattern", default="*.py",
+                        help="glob pattern selecting the scripts to run")
+    parser.add_argument("--output-dir", default="benchmark-results",
+                        help="folder where the results of the run are written")
+    parser.add_argument("--baseline",
+                        help="results of a previous run to compare against")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one is not None:
+        print(json.dumps(run_script(Path(args.run_one))))
+        return
+
+    date = datetime.datetime.now().isoformat(timespec="seconds")
+    results = {
+        "date": date,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "notebooks": benchmark(args.scripts_dir, args.pattern),
+    }
+    output_path = Path(args.output_dir) / f"{date.replace(':', '-')}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=1))
+    print(f"Results written to {output_path}\n")
+
+    baseline = None
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text())
+    report(results, baseline)
+    if any(r["failed"] for r in results["notebooks"].values()):
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Convert the Python scripts into notebooks.
+
+This is equivalent to calling `jupytext --to notebook` on each script, but
+all the conversions happen in a single process (or a pool of workers forked
+from it), such that jupytext is only imported once. Scripts whose content
+did not change since the last build, according to a manifest of content
+hashes, are skipped.
+
+The `helpers` package imported by the scripts is copied next to the
+notebooks, such that they can be run from the notebooks directory.
+
+Usage: python build_tools/build-notebooks.py python_scripts notebooks
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import jupytext
+
+DEFAULT_MANIFEST = Path(__file__).parent.parent / ".notebooks-manifest.json"
+# below this number of notebooks, starting a pool costs more than it saves
+MIN_FILES_FOR_POOL = 8
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(jupytext.__version__.encode())
+    digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def load_manifest(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest, path):
+    """Write the manifest in a temporary file then move it in place."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def convert(script_path, notebook_path):
+    notebook = jupytext.read(script_path)
+    jupytext.write(notebook, notebook_path, fmt="ipynb")
+    return script_path
+
+
+def copy_helpers(scripts_dir, notebooks_dir):
+    """Copy the `helpers` package of the scripts next to the notebooks."""
+    source = Path(scripts_dir) / "helpers"
+    destination = Path(notebooks_dir) / "helpers"
+    if destination.exists():
+        shutil.rmtree(destination)
+    shutil.copytree(source, destination,
+                    ignore=shutil.ignore_patterns("__pycache__"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scripts_dir")
+    parser.add_argument("notebooks_dir")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    parser.add_argument("--n-jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true",
+                        help="convert all scripts, ignoring the manifest")
+    args = parser.parse_args(argv)
+
+    scripts_dir = Path(args.scripts_dir)
+    notebooks_dir = Path(args.notebooks_dir)
+    notebooks_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {} if args.force else load_manifest(args.manifest)
+
+    to_convert, new_manifest = [], {}
+    for script_path in sorted(scripts_dir.glob("*.py")):
+        notebook_path = notebooks_dir / f"{script_path.stem}.ipynb"
+        digest = file_digest(script_path)
+        new_manifest[script_path.name] = digest
+        if manifest.get(script_path.name) != digest or \
+                not notebook_path.exists():
+            to_convert.append((str(script_path), str(notebook_path)))
+
+    if len(to_convert) < MIN_FILES_FOR_POOL or args.n_jobs == 1:
+        converted = [convert(*paths) for paths in to_convert]
+    else:
+        with ProcessPoolExecutor(max_workers=args.n_jobs) as executor:
+            converted = list(executor.map(convert, *zip(*to_convert)))
+
+    for script_path in converted:
+        print(f"Converted {script_path}")
+    print(f"{len(converted)} notebook(s) converted, "
+          f"{len(new_manifest) - len(converted)} up to date")
+    write_manifest(new_manifest, args.manifest)
+    copy_helpers(scripts_dir, notebooks_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ import difflib
 # TODO: we could get the list from .gitignore
 IGNORE_LIST = [
     '.ipynb_checkpoints',
+    # modules shared by the notebooks, not converted to notebooks
+    'helpers',
 ]
 
 folder1, folder2 = sys.argv[1:3]
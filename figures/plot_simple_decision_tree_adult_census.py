@@ -1,13 +1,12 @@
+import sys
 from pathlib import Path
 import numpy as np
 
-from scipy import ndimage
-
-import pandas as pd
-
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import cm
-from matplotlib.colors import ListedColormap
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import ListedColormap, Normalize
+from matplotlib.patches import Rectangle
 
 import seaborn as sns
 
@@ -16,6 +15,9 @@ from sklearn.tree import DecisionTreeClassifier
 
 
 HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE.parent / "python_scripts"))
+
+from helpers.datasets import load_dataset  # noqa: E402
 
 top = cm.get_cmap('Oranges', 128)
 bottom = cm.get_cmap('Blues_r', 128)
@@ -25,14 +27,58 @@ colors = np.vstack([bottom(np.linspace(0, 1, 128)),
 blue_orange_cmap = ListedColormap(colors, name='BlueOrange')
 
 
-adult_census = pd.read_csv("../datasets/adult-census.csv")
+adult_census = load_dataset("adult-census")
 target_column = 'class'
 
 n_samples_to_plot = 5000
 
+
+def leaf_rectangles(tree, bounds):
+    """Compute the rectangle of the feature space covered by each leaf.
+
+    Parameters
+    ----------
+    tree : DecisionTreeClassifier instance
+        A fitted tree using two features.
+    bounds : tuple of (x_min, x_max, y_min, y_max)
+        The limits of the region of the feature space to split.
+
+    Returns
+    -------
+    rectangles : list of tuple of (leaf_id, x_min, x_max, y_min, y_max)
+        One rectangle per leaf intersecting `bounds`.
+    """
+    tree_ = tree.tree_
+    rectangles = []
+    stack = [(0, bounds)]
+    while stack:
+        node_id, (x_min, x_max, y_min, y_max) = stack.pop()
+        if x_min >= x_max or y_min >= y_max:
+            # the leaves below this node are outside of `bounds`
+            continue
+        left, right = (tree_.children_left[node_id],
+                       tree_.children_right[node_id])
+        if left == right:  # both are -1 for a leaf
+            rectangles.append((node_id, x_min, x_max, y_min, y_max))
+            continue
+        threshold = tree_.threshold[node_id]
+        if tree_.feature[node_id] == 0:
+            stack.append((left, (x_min, min(x_max, threshold), y_min, y_max)))
+            stack.append((right, (max(x_min, threshold), x_max, y_min, y_max)))
+        else:
+            stack.append((left, (x_min, x_max, y_min, min(y_max, threshold))))
+            stack.append((right, (x_min, x_max, max(y_min, threshold), y_max)))
+    return rectangles
+
+
 def plot_tree_decision_function(tree, X, y, ax=None):
     """Plot the different decision rules found by a `DecisionTreeClassifier`.
 
+    The leaves of the tree are drawn as rectangles colored by the
+    probability of the positive class. They are computed from the structure
+    of the tree such that the cost of the rendering depends on the number of
+    leaves and not on a grid resolution.
+
     Parameters
     ----------
     tree : DecisionTreeClassifier instance
@@ -44,33 +90,29 @@ def plot_tree_decision_function(tree, X, y, ax=None):
     ax : matplotlib axis
         The matplotlib axis where to plot the different decision rules.
     """
-    import numpy as np
-    from scipy import ndimage
-
     plt.figure(figsize=(12, 10))
-    h = 0.02
     x_min, x_max = 0, 100
     y_min, y_max = 0, 100
-    xx, yy = np.meshgrid(np.arange(x_min, x_max, h),
-                         np.arange(y_min, y_max, h))
-
-    Z = tree.predict_proba(np.c_[xx.ravel(), yy.ravel()])[:, 1]
-    Z = Z.reshape(xx.shape)
-    faces = tree.tree_.apply(
-        np.c_[xx.ravel(), yy.ravel()].astype(np.float32))
-    faces = faces.reshape(xx.shape)
-    border = ndimage.laplace(faces) != 0
     if ax is None:
         ax = plt.gca()
     ax.scatter(X.iloc[:, 0], X.iloc[:, 1],
                c=np.array(['tab:blue', 'tab:orange'])[y],
                s=60, alpha=0.7,
                vmin=0, vmax=1)
-    levels = np.linspace(0, 1, 101)
-    contours = ax.contourf(xx, yy, Z, alpha=.4, levels=levels,
-                           cmap=blue_orange_cmap)
-    ax.get_figure().colorbar(contours, ticks=np.linspace(0, 1, 11))
-    ax.scatter(xx[border], yy[border], marker='.', s=1)
+
+    # depending on the scikit-learn version, the leaves store the class
+    # counts or the class fractions: normalize in both cases
+    leaf_values = tree.tree_.value[:, 0, :]
+    proba = leaf_values[:, 1] / leaf_values.sum(axis=1)
+    norm = Normalize(vmin=0, vmax=1)
+    for leaf_id, x0, x1, y0, y1 in leaf_rectangles(
+            tree, (x_min, x_max, y_min, y_max)):
+        ax.add_patch(Rectangle(
+            (x0, y0), x1 - x0, y1 - y0, alpha=.4, linewidth=1, zorder=0,
+            facecolor=blue_orange_cmap(norm(proba[leaf_id])),
+            edgecolor="tab:blue"))
+    ax.get_figure().colorbar(ScalarMappable(norm=norm, cmap=blue_orange_cmap),
+                             ax=ax, ticks=np.linspace(0, 1, 11))
     ax.set_xlabel(X.columns[0])
     ax.set_ylabel(X.columns[1])
     ax.set_xlim([x_min, x_max])
@@ -0,0 +1,289 @@
+"""
+Caches avoiding to recompute the same results across the notebooks.
+
+The entries are stored on disk, in `datasets/.cache`, such that executing a
+notebook again, or building the book, reuses the results computed by the
+previous executions.
+"""
+
+import copy
+import functools
+import inspect
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import check_cv, cross_validate
+
+from .datasets import CACHE_DIR, _atomic_write
+
+# in-memory entries of the caches, per process, keyed by the location of the
+# cache such that the copies of a cache made by `clone` or sent to the
+# joblib workers share them
+_MEMORY_ENTRIES = {}
+
+
+def _copy_result(result):
+    """Copy a result, except its arrays which are shared read-only.
+
+    The fitted estimators of an entry are copied such that refitting, or
+    setting the parameters of, the estimator of a caller does not change
+    the entry nor the estimators of the other callers.
+    """
+    if isinstance(result, tuple):
+        return tuple(_copy_result(value) for value in result)
+    if isinstance(result, np.ndarray):
+        return result
+    return copy.deepcopy(result)
+
+
+class ResultCache:
+    """Cache of results, in memory and on disk, with size-based eviction.
+
+    The entries are kept in memory, up to `max_entries` of them, and on
+    disk, up to `bytes_limit` bytes. In both cases, the least recently used
+    entries are evicted first. The disk storage is shared with the worker
+    processes of a parallel computation and persists across the executions
+    of the notebooks.
+
+    Parameters
+    ----------
+    location : str or Path
+        Folder where the entries are stored.
+    max_entries : int, default=16
+        Maximum number of entries kept in memory.
+    bytes_limit : int, default=1_000_000_000
+        Maximum size of the entries stored on disk.
+
+    Notes
+    -----
+    The arrays of an entry kept in memory are shared between the callers
+    loading it and are therefore read-only. The other objects, e.g. the
+    fitted estimators, are copied for each caller.
+    """
+
+    def __init__(self, location, max_entries=16, bytes_limit=1_000_000_000):
+        self.location = os.fspath(location)
+        self.max_entries = max_entries
+        self.bytes_limit = bytes_limit
+
+    def __deepcopy__(self, memo):
+        # `clone` deep-copies the parameters of the pipeline: keep using the
+        # same cache
+        return self
+
+    @property
+    def _entries(self):
+        return _MEMORY_ENTRIES.setdefault(self.location, OrderedDict())
+
+    def _path(self, key):
+        return Path(self.location) / f"{key}.pkl"
+
+    def _get(self, key):
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            return _copy_result(entries[key])
+        path = self._path(key)
+        try:
+            result = joblib.load(path)
+            # the modification time orders the entries on disk
+            os.utime(path)
+        except (OSError, EOFError):
+            # missing, or removed by another process meanwhile
+            return None
+        self._remember(key, result)
+        return _copy_result(result)
+
+    def _set(self, key, result):
+        _atomic_write(
+            self._path(key), lambda path: joblib.dump(result, path))
+        self._remember(key, _copy_result(result))
+        self._reduce_size()
+
+    def _remember(self, key, result):
+        for value in result if isinstance(result, tuple) else (result,):
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+        entries = self._entries
+        entries[key] = result
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def _reduce_size(self):
+        """Remove the least recently used entries stored on disk."""
+        files = []
+        with os.scandir(self.location) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.bytes_limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= file_size
+
+    def cache(self, func, ignore=None):
+        """Return a version of `func` whose results are cached.
+
+        This follows the API of `joblib.Memory.cache` used by `Pipeline`.
+        The arguments listed in `ignore` are not part of the key.
+        """
+        signature = inspect.signature(func)
+        ignore = set(ignore or ())
+        func_name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def cached_func(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs).arguments
+            key = joblib.hash((func_name, {
+                name: value for name, value in arguments.items()
+                if name not in ignore}))
+            result = self._get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                self._set(key, result)
+            return result
+
+        return cached_func
+
+    def clear(self):
+        """Remove all the entries, in memory and on disk."""
+        self._entries.clear()
+        if os.path.isdir(self.location):
+            for name in os.listdir(self.location):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.location, name))
+
+
+class TransformerCache(ResultCache):
+    """Cache of the fitted transformers of a pipeline.
+
+    An instance is meant to be passed as the `memory` parameter of a
+    scikit-learn `Pipeline`. When a step of the pipeline is fitted, the
+    fitted transformer and the transformed data are stored, keyed by a hash
+    of the parameters of the transformer and of the data it is fitted on.
+    Within a grid-search where only the hyperparameters of the final
+    predictor change, the preprocessing of each cross-validation fold is thus
+    computed once instead of once per candidate.
+
+    The entries are kept in memory and on disk, see `ResultCache`.
+
+    Parameters
+    ----------
+    location : str or Path, default=None
+        Folder where the entries are stored. By default, a folder of
+        `datasets/.cache`.
+    max_entries : int, default=16
+        Maximum number of entries kept in memory.
+    bytes_limit : int, default=1_000_000_000
+        Maximum size of the entries stored on disk.
+    """
+
+    def __init__(self, location=None, max_entries=16,
+                 bytes_limit=1_000_000_000):
+        if location is None:
+            location = CACHE_DIR / "transformers"
+        super().__init__(location, max_entries=max_entries,
+                         bytes_limit=bytes_limit)
+
+
+_CROSS_VALIDATE_CACHE = ResultCache(CACHE_DIR / "cross_validate")
+
+
+def _has_callable_scorer(scoring):
+    if isinstance(scoring, dict):
+        scoring = list(scoring.values())
+    if isinstance(scoring, (list, tuple)):
+        return any(map(callable, scoring))
+    return callable(scoring)
+
+
+def cached_cross_validate(estimator, X, y=None, *, groups=None, cv=None,
+                          scoring=None, n_jobs=None, return_train_score=False,
+                          return_estimator=False, cache=None):
+    """Evaluate a model by cross-validation, reusing previous results.
+
+    This is `sklearn.model_selection.cross_validate` whose results are
+    stored in a cache. They are keyed by the parameters of the estimator, a
+    hash of the data, the indices of the splits, the scoring and the
+    requested outputs. When the same evaluation is run again, in the same
+    notebook or in another one, the results are loaded instead of fitting the
+    models again.
+
+    Parameters
+    ----------
+    estimator : estimator
+        The model to evaluate.
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,), default=None
+        The target.
+    groups : array-like of shape (n_samples,), default=None
+        Group labels of the samples, used by the group-wise
+        cross-validation strategies.
+    cv : int, cross-validation generator or iterable, default=None
+        The cross-validation strategy, as for `cross_validate`.
+    scoring : str, callable, list or dict, default=None
+        The metrics, as for `cross_validate`.
+    n_jobs : int, default=None
+        Number of worker processes running the fits, when they are not
+        cached.
+    return_train_score : bool, default=False
+        Whether to also return the scores on the training sets.
+    return_estimator : bool, default=False
+        Whether to also return the fitted estimators.
+    cache : ResultCache, default=None
+        Where the results are stored. By default, a folder of
+        `datasets/.cache`.
+
+    Returns
+    -------
+    scores : dict
+        Same output as `cross_validate`. The timings are those of the
+        evaluation when it was computed.
+
+    Notes
+    -----
+    The splits are part of the key through their indices: a
+    cross-validation strategy shuffling the samples needs a fixed
+    `random_state` for the results to be reused. On the contrary, the
+    estimator is keyed by its parameters only: the results of an estimator
+    whose `random_state` is `None` are those of its first evaluation.
+
+    A callable scorer is only identified by its name, if any, and not by its
+    code: its results would not be recomputed when it is edited. The
+    evaluations with a callable `scoring`, or a list or dict containing
+    callables, are therefore not cached.
+    """
+    cache = _CROSS_VALIDATE_CACHE if cache is None else cache
+    cv = check_cv(cv, y, classifier=is_classifier(estimator))
+    splits = [(train, test) for train, test in cv.split(X, y, groups)]
+    if _has_callable_scorer(scoring):
+        return cross_validate(
+            estimator, X, y, cv=splits, scoring=scoring, n_jobs=n_jobs,
+            return_train_score=return_train_score,
+            return_estimator=return_estimator)
+    key = joblib.hash((
+        "cross_validate", clone(estimator), joblib.hash((X, y)), splits,
+        scoring, return_train_score, return_estimator))
+
+    results = cache._get(key)
+    if results is None:
+        results = cross_validate(
+            estimator, X, y, cv=splits, scoring=scoring, n_jobs=n_jobs,
+            return_train_score=return_train_score,
+            return_estimator=return_estimator)
+        cache._set(key, results)
+    return results
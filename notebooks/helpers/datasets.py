@@ -0,0 +1,226 @@
+"""
+Loaders for the datasets used in the course.
+
+The CSV files of the `datasets` folder are parsed once and stored in a
+binary columnar cache next to them. Subsequent loads read the cache instead
+of parsing the CSV file again. The California housing dataset is stored as
+memory-mapped `.npy` files such that no network access is needed once the
+store is populated.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .smoke import smoke_subsample
+
+DATASETS_DIR = Path(__file__).resolve().parents[2] / "datasets"
+CACHE_DIR = DATASETS_DIR / ".cache"
+
+try:
+    import pyarrow  # noqa: F401
+    _CACHE_FORMAT = "feather"
+except ImportError:
+    _CACHE_FORMAT = "pkl"
+
+
+def _file_digest(path, chunk_size=1 << 20):
+    """Compute a hash of the content of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    """Call `write` on a temporary file and move it to `path` once done."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # `mkstemp` restricts the permissions to the owner
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_cache(df, path):
+    if _CACHE_FORMAT == "feather":
+        _atomic_write(path, df.reset_index(drop=True).to_feather)
+    else:
+        _atomic_write(path, lambda p: df.to_pickle(p, protocol=4))
+
+
+def _read_cache(path):
+    if _CACHE_FORMAT == "feather":
+        return pd.read_feather(path)
+    return pd.read_pickle(path)
+
+
+def load_dataset(name, categorical=False, data_home=None):
+    """Load one of the CSV files of the `datasets` folder.
+
+    The first call parses the CSV file, converts the string columns to the
+    `category` dtype and stores the result in a binary cache. The cache is
+    keyed by the content of the CSV file such that editing the file
+    invalidates it.
+
+    Parameters
+    ----------
+    name : str
+        Name of the dataset, with or without the `.csv` extension, e.g.
+        `"adult-census"`.
+    categorical : bool, default=False
+        Whether to return the string columns with the `category` dtype,
+        which uses less memory. By default, they are converted back to the
+        dtype given by `pd.read_csv`, e.g. `object`, such that the column
+        selectors based on the dtype keep working.
+    data_home : str or Path, default=None
+        Folder containing the CSV files. By default, the `datasets` folder
+        of the repository.
+
+    Returns
+    -------
+    df : dataframe
+        The loaded dataset. In smoke mode, a subsample of the rows (see
+        `helpers.smoke`).
+    """
+    data_home = DATASETS_DIR if data_home is None else Path(data_home)
+    stem = name[:-len(".csv")] if name.endswith(".csv") else name
+    csv_path = data_home / f"{stem}.csv"
+
+    digest = _file_digest(csv_path)
+    cache_dir = data_home / CACHE_DIR.name
+    cache_path = cache_dir / f"{stem}-{digest}.{_CACHE_FORMAT}"
+
+    if cache_path.exists():
+        df = _read_cache(cache_path)
+    else:
+        df = pd.read_csv(csv_path)
+        # pandas >= 3 gives the `str` dtype to the string columns
+        string_columns = df.select_dtypes(
+            include=["object", "string"]).columns
+        df[string_columns] = df[string_columns].astype("category")
+        _write_cache(df, cache_path)
+        # drop the caches of previous versions of the CSV file
+        for stale_path in cache_dir.glob(f"{stem}-*.{_CACHE_FORMAT}"):
+            stale_digest = stale_path.stem[len(stem) + 1:]
+            if (stale_path != cache_path
+                    and len(stale_digest) == len(digest)
+                    and all(c in "0123456789abcdef" for c in stale_digest)):
+                stale_path.unlink()
+
+    if not categorical:
+        # use the dtype of the categories, i.e. the one `pd.read_csv` gives
+        for column in df.select_dtypes(include="category").columns:
+            df[column] = df[column].astype(df[column].cat.categories.dtype)
+    return smoke_subsample(df)
+
+
+def _write_array(array, path):
+    def write(tmp_path):
+        # pass a file object: `np.save` would append `.npy` to the filename
+        with open(tmp_path, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+
+    _atomic_write(path, write)
+
+
+def _populate_california_housing(store_dir, download_if_missing):
+    """Copy the California housing data from scikit-learn into `store_dir`."""
+    from sklearn import datasets
+
+    housing = datasets.fetch_california_housing(
+        download_if_missing=download_if_missing)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    # store the features column-wise such that selecting a column of the
+    # dataframe reads a contiguous block of the memory map
+    _write_array(np.asfortranarray(housing.data, dtype=np.float64),
+                 store_dir / "data.npy")
+    _write_array(np.asarray(housing.target, dtype=np.float64),
+                 store_dir / "target.npy")
+    metadata = {
+        "feature_names": list(housing.feature_names),
+        "target_name": "MedHouseVal",
+        "DESCR": housing.DESCR,
+    }
+    _atomic_write(store_dir / "metadata.json",
+                  lambda p: Path(p).write_text(json.dumps(metadata)))
+
+
+def fetch_california_housing(*, data_home=None, download_if_missing=True,
+                             return_X_y=False, as_frame=False):
+    """Load the California housing dataset from a local memory-mapped store.
+
+    This is a drop-in replacement for
+    `sklearn.datasets.fetch_california_housing`. The features and the target
+    are stored as `.npy` files in the `datasets` folder and memory-mapped in
+    read-only mode, such that the data is not copied into each Python
+    process. The store is populated from scikit-learn the first time the
+    function is called.
+
+    Parameters
+    ----------
+    data_home : str or Path, default=None
+        Folder containing the store. By default, the `datasets` folder of
+        the repository.
+    download_if_missing : bool, default=True
+        Whether scikit-learn can download the data when populating the
+        store.
+    return_X_y : bool, default=False
+        If True, returns `(data, target)` instead of a Bunch object.
+    as_frame : bool, default=False
+        If True, the data is a pandas dataframe and the target a pandas
+        series.
+
+    Returns
+    -------
+    dataset : Bunch or tuple
+        Same output as `sklearn.datasets.fetch_california_housing`. In smoke
+        mode, a subsample of the rows (see `helpers.smoke`).
+    """
+    from sklearn.utils import Bunch
+
+    data_home = DATASETS_DIR if data_home is None else Path(data_home)
+    store_dir = data_home / "california_housing"
+    if not (store_dir / "metadata.json").exists():
+        _populate_california_housing(store_dir, download_if_missing)
+
+    metadata = json.loads((store_dir / "metadata.json").read_text())
+    feature_names = metadata["feature_names"]
+    target_name = metadata["target_name"]
+    data = np.load(store_dir / "data.npy", mmap_mode="r")
+    target = np.load(store_dir / "target.npy", mmap_mode="r")
+    data, target = smoke_subsample(data, target)
+
+    if as_frame:
+        if isinstance(data, np.memmap):
+            # a dataframe stores the transposed data; joblib would rebuild
+            # this transposed view of a column-major memory map with the
+            # wrong layout in its workers. Map the file as the row-major
+            # transposed array instead, such that the dataframe holds the
+            # memory map itself.
+            data = np.memmap(
+                data.filename, dtype=data.dtype, mode="r",
+                offset=data.offset, shape=data.shape[::-1]).T
+        data = pd.DataFrame(data, columns=feature_names, copy=False)
+        target = pd.Series(target, name=target_name, copy=False)
+
+    if return_X_y:
+        return data, target
+
+    # concatenating copies the data: only do it when the frame is requested
+    frame = pd.concat([data, target], axis=1) if as_frame else None
+
+    return Bunch(data=data, target=target, frame=frame,
+                 target_names=[target_name], feature_names=feature_names,
+                 DESCR=metadata["DESCR"])
@@ -0,0 +1,184 @@
+"""
+Fast computations of the paths of regularized linear models.
+"""
+
+import numpy as np
+from sklearn.model_selection import check_cv
+from sklearn.utils import Bunch
+
+
+def ridge_path(X, y, alphas, X_valid=None, y_valid=None):
+    """Fit a ridge model for each value of `alphas` at once.
+
+    As `Ridge(alpha=alpha)` with an intercept, the data are centered and
+    the coefficients minimize `||y - X w||^2 + alpha ||w||^2`. Given the
+    singular value decomposition `X = U S V^T` of the centered data, the
+    coefficients are `V diag(s / (s^2 + alpha)) U^T y`: a single
+    decomposition gives the coefficients of all the values of `alpha`.
+
+    The validation scores are computed from the Gram matrix of the
+    validation data projected on `V`, such that their cost does not depend
+    on the number of validation samples once this matrix is computed.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        The training data, already preprocessed (e.g. expanded and scaled).
+    y : array-like of shape (n_samples,)
+        The training target.
+    alphas : array-like of shape (n_alphas,)
+        The regularization strengths.
+    X_valid : array-like of shape (n_valid_samples, n_features), default=None
+        Validation data, preprocessed as `X`.
+    y_valid : array-like of shape (n_valid_samples,), default=None
+        Validation target.
+
+    Returns
+    -------
+    result : Bunch
+        With the attributes `coefs` of shape (n_alphas, n_features),
+        `intercepts` of shape (n_alphas,) and, if `X_valid` is given,
+        `valid_scores`, the R2 score on the validation set, of shape
+        (n_alphas,).
+    """
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    alphas = np.asarray(alphas, dtype=np.float64)
+    X_mean, y_mean = X.mean(axis=0), y.mean()
+    U, s, Vt = np.linalg.svd(X - X_mean, full_matrices=False)
+
+    # shrinkage of each singular direction, shape (n_components, n_alphas)
+    shrinkage = s[:, np.newaxis] / (s[:, np.newaxis] ** 2 + alphas)
+    # coefficients expressed in the basis of the right singular vectors
+    weights = shrinkage * (U.T @ (y - y_mean))[:, np.newaxis]
+    coefs = (Vt.T @ weights).T
+    result = Bunch(coefs=coefs, intercepts=y_mean - coefs @ X_mean)
+
+    if X_valid is not None:
+        X_valid = np.asarray(X_valid, dtype=np.float64)
+        y_valid = np.asarray(y_valid, dtype=np.float64)
+        projected = (X_valid - X_mean) @ Vt.T
+        residual = y_valid - y_mean
+        # ||residual - projected @ w||^2 expanded for all the alphas at once
+        gram = projected.T @ projected
+        sum_squares = (
+            residual @ residual
+            - 2 * (residual @ projected) @ weights
+            + np.einsum("ij,ij->j", weights, gram @ weights)
+        )
+        total_sum_squares = np.sum((y_valid - y_valid.mean()) ** 2)
+        result.valid_scores = (
+            1 - np.maximum(sum_squares, 0) / total_sum_squares)
+    return result
+
+
+def _sufficient_statistics(X, y):
+    """Statistics of a set of samples from which a ridge model is fitted."""
+    return Bunch(n_samples=len(y), X_sum=X.sum(axis=0), y_sum=y.sum(),
+                 XtX=X.T @ X, Xty=X.T @ y, yty=y @ y)
+
+
+def _subtract_statistics(total, subset):
+    return Bunch(**{key: total[key] - subset[key] for key in total})
+
+
+def _solve_ridge(stats, alpha, scale):
+    """Fit a ridge model with an intercept from sufficient statistics.
+
+    When `scale=True`, the features are standardized with the mean and
+    standard deviation of the samples, as a `StandardScaler` would do, and
+    the returned coefficients are the ones of the standardized features.
+    """
+    X_mean = stats.X_sum / stats.n_samples
+    y_mean = stats.y_sum / stats.n_samples
+    # statistics of the centered data
+    XtX = stats.XtX - stats.n_samples * np.outer(X_mean, X_mean)
+    Xty = stats.Xty - stats.n_samples * X_mean * y_mean
+    X_scale = np.ones_like(X_mean)
+    if scale:
+        X_scale = np.sqrt(np.maximum(np.diag(XtX) / stats.n_samples, 0))
+        # constant features are left as is, as in StandardScaler
+        X_scale[X_scale < 10 * np.finfo(X_scale.dtype).eps] = 1.
+        XtX = XtX / np.outer(X_scale, X_scale)
+        Xty = Xty / X_scale
+    if alpha == 0:
+        coef = np.linalg.lstsq(XtX, Xty, rcond=None)[0]
+    else:
+        coef = np.linalg.solve(XtX + alpha * np.eye(len(Xty)), Xty)
+    # coefficients and intercept in the units of the original features
+    raw_coef = coef / X_scale
+    return coef, raw_coef, y_mean - X_mean @ raw_coef
+
+
+def _r2_score_from_statistics(stats, raw_coef, intercept):
+    """R2 score of a linear model on the samples summarized by `stats`."""
+    sum_squares = (
+        stats.yty
+        - 2 * (intercept * stats.y_sum + raw_coef @ stats.Xty)
+        + stats.n_samples * intercept ** 2
+        + 2 * intercept * raw_coef @ stats.X_sum
+        + raw_coef @ stats.XtX @ raw_coef
+    )
+    total_sum_squares = stats.yty - stats.y_sum ** 2 / stats.n_samples
+    return 1 - sum_squares / total_sum_squares
+
+
+def ridge_cross_validate(X, y, cv=5, alpha=1.0, scale=True):
+    """Cross-validate a ridge model from sufficient statistics.
+
+    This gives the same results as `cross_validate` on
+    `make_pipeline(StandardScaler(), Ridge(alpha=alpha))`, without fitting
+    a model on each training set. A ridge model only depends on the data
+    through the sums of the features and of the target, `X^T X` and
+    `X^T y`. These statistics are computed once on the whole dataset and on
+    each testing set, which amounts to a single pass over the data for each
+    partition of the samples; those of a training set are obtained by
+    subtraction, and the model is then found by solving a linear system of
+    size `n_features`. The testing scores are computed from the same
+    statistics.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,)
+        The target.
+    cv : int or cross-validation generator, default=5
+        The cross-validation strategy.
+    alpha : float, default=1.0
+        The regularization strength. With `alpha=0`, this is an ordinary
+        least squares model.
+    scale : bool, default=True
+        Whether to standardize the features of each training set, as a
+        `StandardScaler` would do.
+
+    Returns
+    -------
+    result : dict
+        With the keys `test_score`, the R2 score of each split, `coef`, the
+        coefficients of the model fitted on each split, of shape
+        (n_splits, n_features), and `intercept`. The coefficients are the
+        ones of the standardized features when `scale=True`, as `coef_` of
+        the ridge model of the pipeline, whereas the intercept is expressed
+        in the units of the original features.
+    """
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    # working with the centered data improves the numerical precision of
+    # the statistics; the models fitted have an intercept anyway
+    X_offset, y_offset = X.mean(axis=0), y.mean()
+    X, y = X - X_offset, y - y_offset
+    total = _sufficient_statistics(X, y)
+
+    result = {"test_score": [], "coef": [], "intercept": []}
+    for train, test in check_cv(cv).split(X, y):
+        test_stats = _sufficient_statistics(X[test], y[test])
+        if len(train) + len(test) == len(y):
+            train_stats = _subtract_statistics(total, test_stats)
+        else:
+            train_stats = _sufficient_statistics(X[train], y[train])
+        coef, raw_coef, intercept = _solve_ridge(train_stats, alpha, scale)
+        result["test_score"].append(
+            _r2_score_from_statistics(test_stats, raw_coef, intercept))
+        result["coef"].append(coef)
+        result["intercept"].append(
+            intercept + y_offset - X_offset @ raw_coef)
+    return {key: np.array(value) for key, value in result.items()}
@@ -0,0 +1,141 @@
+"""
+Planning of the nested parallelism of the cross-validations and searches.
+
+A cross-validation or a search run with `n_jobs` starts one worker process
+per CPU core. When the evaluated model is itself parallel, e.g. a random
+forest with `n_jobs=-1`, a nested search, or a model relying on OpenMP or
+BLAS threads as the histogram gradient-boosting, each worker also starts one
+thread per core. The cores are then oversubscribed, which can be slower than
+running sequentially. `plan_parallelism` splits the cores between the worker
+processes and the threads of each worker instead.
+"""
+
+import contextlib
+
+from joblib import cpu_count, effective_n_jobs, parallel_backend
+from sklearn.base import clone
+from threadpoolctl import threadpool_limits
+
+
+def _is_estimator(value):
+    return hasattr(value, "get_params") and not isinstance(value, type)
+
+
+def _has_sub_estimators(estimator):
+    """Whether an estimator fits other estimators, e.g. a search."""
+    for value in estimator.get_params(deep=False).values():
+        if _is_estimator(value):
+            return True
+        # lists of (name, estimator) tuples, e.g. for a ColumnTransformer
+        if isinstance(value, (list, tuple)) and any(
+                isinstance(item, tuple) and any(map(_is_estimator, item))
+                for item in value):
+            return True
+    return False
+
+
+class ParallelPlan:
+    """Split of the CPU cores between worker processes and their threads.
+
+    Use `estimator` and `n_jobs` in the parallel call, within a `with`
+    block on the plan, which limits the OpenMP and BLAS threads of the
+    workers, or of the current process when `n_jobs` is 1, to
+    `n_threads`.
+
+    Attributes
+    ----------
+    estimator : estimator
+        A copy of the estimator whose nested `n_jobs` parameters are set:
+        to `n_threads` for the estimators parallelizing their own
+        computations, e.g. a random forest, and to 1 for the
+        meta-estimators, e.g. a search, whose inner estimators use the
+        threads instead.
+    n_jobs : int
+        Number of worker processes to use in the parallel call.
+    n_threads : int
+        Number of threads of each worker.
+    n_cores : int
+        Number of cores shared.
+    nested_n_jobs : dict
+        The nested `n_jobs` parameters set in `estimator`.
+    """
+
+    def __init__(self, estimator, n_jobs, n_threads, n_cores,
+                 nested_n_jobs):
+        self.estimator = estimator
+        self.n_jobs = n_jobs
+        self.n_threads = n_threads
+        self.n_cores = n_cores
+        self.nested_n_jobs = nested_n_jobs
+        self._stack = None
+
+    def __repr__(self):
+        nested = ", ".join(
+            f"{name}={value}" for name, value in self.nested_n_jobs.items())
+        return (
+            f"{self.n_jobs} worker process(es) x {self.n_threads} thread(s) "
+            f"on {self.n_cores} core(s)"
+            + (f"; nested parameters: {nested}" if nested else ""))
+
+    def __enter__(self):
+        self._stack = contextlib.ExitStack()
+        if self.n_jobs > 1:
+            # the threads of the workers are limited through their
+            # environment
+            self._stack.enter_context(parallel_backend(
+                "loky", inner_max_num_threads=self.n_threads))
+        else:
+            # the estimators are fitted in the current process: the backend
+            # is left untouched, such that e.g. a random forest keeps
+            # preferring threads for its trees
+            self._stack.enter_context(
+                threadpool_limits(limits=self.n_threads))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+
+
+def plan_parallelism(estimator, n_tasks, n_jobs=-1):
+    """Split the cores between the parallel tasks and their threads.
+
+    The cores are first given to worker processes, one per task, and the
+    remaining cores are given as threads to each worker: processes do not
+    share the Python interpreter while the threads of the estimators mostly
+    run compiled code. Thus, with 64 cores, a 5-fold cross-validation uses
+    5 workers of 12 threads, and a search with 45 tasks uses 45 workers of a
+    single thread.
+
+    Parameters
+    ----------
+    estimator : estimator
+        The estimator fitted in each task, e.g. the model given to
+        `cross_validate` or to `GridSearchCV`.
+    n_tasks : int
+        Number of tasks of the parallel call, e.g. the number of splits of a
+        cross-validation or, for a search, the number of candidates times
+        the number of splits.
+    n_jobs : int, default=-1
+        The number of cores to use, as the `n_jobs` of joblib.
+
+    Returns
+    -------
+    plan : ParallelPlan
+        The layout; printing it reports the chosen split.
+    """
+    n_cores = min(effective_n_jobs(n_jobs), cpu_count())
+    n_processes = max(1, min(n_tasks, n_cores))
+    n_threads = max(1, n_cores // n_processes)
+
+    params = estimator.get_params(deep=True)
+    nested_n_jobs = {}
+    for name in params:
+        if name != "n_jobs" and not name.endswith("__n_jobs"):
+            continue
+        owner = (estimator if name == "n_jobs"
+                 else params[name[:-len("__n_jobs")]])
+        nested_n_jobs[name] = 1 if _has_sub_estimators(owner) else n_threads
+    estimator = clone(estimator).set_params(**nested_n_jobs)
+    return ParallelPlan(estimator, n_processes, n_threads, n_cores,
+                        nested_n_jobs)
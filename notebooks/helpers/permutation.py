@@ -0,0 +1,201 @@
+"""
+Permutation tests of the cross-validated performance of a model.
+
+`sklearn.model_selection.permutation_test_score` splits the data again and
+fits the model from scratch for each permutation of the target. The function
+`permutation_test` splits the data once, draws the permutations by batches,
+as the rows of an index matrix, and stops drawing them once the p-value is
+known to be below or above the significance level. Thousands of permutations
+can then be afforded to compute small p-values.
+"""
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.stats import beta
+from sklearn.base import clone, is_classifier
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.model_selection import check_cv
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.utils import check_random_state
+
+from .sharing import share_data
+
+# the estimators whose fit on a multi-output target is the same as fitting
+# each output on its own, while e.g. a decision tree grows a single tree for
+# all the outputs. Their subclasses, e.g. `MultiTaskLasso`, are not included.
+_INDEPENDENT_OUTPUTS = (
+    DummyRegressor, ElasticNet, KNeighborsClassifier, KNeighborsRegressor,
+    Lasso, LinearRegression, Ridge)
+
+
+def _subset(X, indices):
+    return X.iloc[indices] if hasattr(X, "iloc") else X[indices]
+
+
+def _fits_outputs_independently(estimator):
+    if isinstance(estimator, Pipeline):
+        estimator = estimator.steps[-1][1]
+    return type(estimator) in _INDEPENDENT_OUTPUTS
+
+
+def _permutation_matrix(n_permutations, n_samples, groups, rng):
+    """Draw permutations of the samples, one per row.
+
+    With `groups`, the samples are only permuted within their group, as in
+    `permutation_test_score`.
+    """
+    if groups is None:
+        return rng.rand(n_permutations, n_samples).argsort(axis=1)
+    permutations = np.empty((n_permutations, n_samples), dtype=np.intp)
+    for group in np.unique(groups):
+        indices = np.flatnonzero(groups == group)
+        permutations[:, indices] = indices[
+            rng.rand(n_permutations, len(indices)).argsort(axis=1)]
+    return permutations
+
+
+def _score_permutations(estimator, X, y, train, test, permutations,
+                        score_func, stack_targets):
+    """Scores on one split of the model fitted on each permuted target."""
+    targets = np.asarray(y)[permutations]
+    X_train, X_test = _subset(X, train), _subset(X, test)
+    if stack_targets:
+        # one model whose outputs are the permuted targets
+        model = clone(estimator).fit(X_train, targets[:, train].T)
+        y_pred = model.predict(X_test).reshape(len(test), -1).T
+    else:
+        y_pred = [clone(estimator).fit(X_train, target[train]).predict(X_test)
+                  for target in targets]
+    return [score_func(target[test], target_pred)
+            for target, target_pred in zip(targets, y_pred)]
+
+
+def _cross_val_permutations(parallel, estimator, X, y, splits, permutations,
+                            score_func, stack_targets):
+    """Mean score over the splits of each permuted target."""
+    chunks = ([permutations] if stack_targets
+              else np.split(permutations, len(permutations)))
+    scores = parallel(
+        delayed(_score_permutations)(
+            estimator, X, y, train, test, chunk, score_func, stack_targets)
+        for chunk in chunks for train, test in splits)
+    return np.reshape(scores, (len(chunks), len(splits), -1)).mean(
+        axis=1).ravel()
+
+
+def _pvalue_interval(n_greater, n_permutations, confidence_level):
+    """Clopper-Pearson interval of the p-value estimated by permutations."""
+    tail = (1 - confidence_level) / 2
+    low = (beta.ppf(tail, n_greater, n_permutations - n_greater + 1)
+           if n_greater > 0 else 0.0)
+    high = (beta.ppf(1 - tail, n_greater + 1, n_permutations - n_greater)
+            if n_greater < n_permutations else 1.0)
+    return low, high
+
+
+def permutation_test(estimator, X, y, groups=None, cv=None,
+                     n_permutations=1000, score_func=None, significance=0.05,
+                     confidence_level=0.99, batch_size=100,
+                     stack_targets=False, n_jobs=None, random_state=None):
+    """Evaluate the significance of a cross-validated score by permutations.
+
+    As `permutation_test_score`, the score of the model is compared with the
+    scores of the model cross-validated with the target randomly permuted.
+    The data is split once and these splits are used for all the
+    permutations. The permutations are drawn by batches of `batch_size` and
+    the test stops after a batch once the confidence interval of the p-value
+    lies entirely below or above `significance`: the conclusion of the test
+    would not change with more permutations.
+
+    Parameters
+    ----------
+    estimator : estimator
+        The model to evaluate.
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,)
+        The target.
+    groups : array-like of shape (n_samples,), default=None
+        Group labels of the samples. The target is then only permuted
+        within the groups, and the labels are given to the cross-validation
+        strategy.
+    cv : int or cross-validation generator, default=None
+        The cross-validation strategy, 5-fold by default.
+    n_permutations : int, default=1000
+        Maximum number of permutations of the target.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)`. By default,
+        the accuracy for a classifier and the R2 score for a regressor.
+    significance : float or None, default=0.05
+        Significance level of the test. If None, all the `n_permutations`
+        permutations are evaluated.
+    confidence_level : float, default=0.99
+        Confidence level of the interval of the p-value used to stop early.
+    batch_size : int, default=100
+        Number of permutations drawn before checking whether to stop.
+    stack_targets : bool, default=False
+        Whether to fit the permuted targets of a batch in a single call to
+        `fit`, as the outputs of a multi-output target. This is only valid
+        for the estimators fitting each output independently and is thus
+        restricted to `LinearRegression`, `Ridge`, `Lasso`, `ElasticNet`,
+        the nearest neighbors and `DummyRegressor`, or to a pipeline ending
+        with one of them whose other steps do not use the target. A
+        decision tree, for instance, would fit a single tree for all the
+        outputs.
+    n_jobs : int, default=None
+        Number of worker processes running the fits.
+    random_state : int, RandomState instance or None, default=None
+        Controls the permutations of the target.
+
+    Returns
+    -------
+    score : float
+        The cross-validated score of the model on the original target.
+    permutation_scores : ndarray of shape (n_permutations_evaluated,)
+        The cross-validated scores on the permuted targets.
+    pvalue : float
+        The p-value, as given by `permutation_test_score`:
+        `(C + 1) / (n_permutations_evaluated + 1)` where `C` is the number
+        of permutations scoring at least `score`.
+    """
+    if stack_targets and not _fits_outputs_independently(estimator):
+        raise ValueError(
+            f"{estimator!r} does not fit the outputs of a multi-output "
+            "target independently: the permuted targets cannot be fitted in "
+            "a single call.")
+    if score_func is None:
+        score_func = accuracy_score if is_classifier(estimator) else r2_score
+    rng = check_random_state(random_state)
+    X, y = share_data(X, y)
+    cv = check_cv(cv, y, classifier=is_classifier(estimator))
+    splits = list(cv.split(X, y, groups))
+    groups = None if groups is None else np.asarray(groups)
+    n_samples = len(y)
+
+    permutation_scores = []
+    n_evaluated = n_greater = 0
+    with Parallel(n_jobs=n_jobs) as parallel:
+        score = _cross_val_permutations(
+            parallel, estimator, X, y, splits,
+            np.arange(n_samples)[np.newaxis], score_func, False)[0]
+        while n_evaluated < n_permutations:
+            permutations = _permutation_matrix(
+                min(batch_size, n_permutations - n_evaluated), n_samples,
+                groups, rng)
+            scores = _cross_val_permutations(
+                parallel, estimator, X, y, splits, permutations, score_func,
+                stack_targets)
+            permutation_scores.append(scores)
+            n_evaluated += len(scores)
+            n_greater += np.count_nonzero(scores >= score)
+            if significance is not None:
+                low, high = _pvalue_interval(
+                    n_greater, n_evaluated, confidence_level)
+                if high < significance or low > significance:
+                    break
+
+    pvalue = (n_greater + 1) / (n_evaluated + 1)
+    return score, np.concatenate(permutation_scores), pvalue
@@ -0,0 +1,271 @@
+"""
+Plotting utilities shared by the notebooks.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+@lru_cache(maxsize=8)
+def _make_grid(bounds, plot_step):
+    """Create the grid of samples covering `bounds`.
+
+    The grid is cached such that successive plots with the same
+    `range_features` do not create it again. The arrays are read-only since
+    they are shared between the calls.
+    """
+    (x_min, x_max), (y_min, y_max) = bounds
+    xx, yy = np.meshgrid(
+        np.arange(x_min, x_max, plot_step),
+        np.arange(y_min, y_max, plot_step),
+    )
+    grid = np.c_[xx.ravel(), yy.ravel()]
+    for array in (xx, yy, grid):
+        array.setflags(write=False)
+    return xx, yy, grid
+
+
+def _predict_labels(fitted_classifier, X, batch_size):
+    """Predict `X` by batches and encode the predictions as integers.
+
+    The integer of a prediction is its index in `fitted_classifier.classes_`
+    such that a class is always plotted with the same color.
+    """
+    classes = getattr(fitted_classifier, "classes_", None)
+    labels = np.empty(X.shape[0], dtype=np.intp)
+    predictions = []
+    for start in range(0, X.shape[0], batch_size):
+        batch = fitted_classifier.predict(X[start:start + batch_size])
+        if classes is not None:
+            labels[start:start + batch_size] = np.searchsorted(classes, batch)
+        else:
+            predictions.append(batch)
+    if classes is None:
+        _, labels = np.unique(np.concatenate(predictions), return_inverse=True)
+    return labels
+
+
+def plot_decision_function(fitted_classifier, range_features, ax=None,
+                           plot_step=0.02, batch_size=100_000):
+    """Plot the boundary of the decision function of a classifier.
+
+    Parameters
+    ----------
+    fitted_classifier : estimator
+        A fitted classifier taking two features as input.
+    range_features : dict
+        The name of the two features mapped to the `(min, max)` range in
+        which to evaluate the classifier.
+    ax : matplotlib axis, default=None
+        The axis where to plot. By default, a new figure is created.
+    plot_step : float, default=0.02
+        The resolution of the grid of samples where the classifier is
+        evaluated.
+    batch_size : int, default=100_000
+        Number of samples of the grid predicted at once. It bounds the memory
+        used by the predictions.
+
+    Returns
+    -------
+    ax : matplotlib axis
+        The axis where the decision function has been plotted.
+    """
+    bounds = tuple(
+        (float(min_value), float(max_value))
+        for min_value, max_value in range_features.values()
+    )
+    xx, yy, grid = _make_grid(bounds, plot_step)
+
+    # compute the associated prediction
+    Z = _predict_labels(fitted_classifier, grid, batch_size)
+    Z = Z.reshape(xx.shape)
+
+    # make the plot of the boundary and the data samples
+    if ax is None:
+        _, ax = plt.subplots()
+    ax.contourf(xx, yy, Z, alpha=0.4, cmap="RdBu")
+    feature_names = list(range_features.keys())
+    ax.set_xlabel(feature_names[0])
+    ax.set_ylabel(feature_names[1])
+
+    return ax
+
+
+class ThresholdExplorer:
+    """Link the decision threshold of a classifier to its PR and ROC curves.
+
+    The probabilities, the curves and the confusion matrices for all the
+    possible thresholds are computed once when creating the explorer.
+    Changing the threshold then only moves the markers on the curves and
+    updates the confusion matrix, without predicting or recomputing
+    anything.
+
+    Parameters
+    ----------
+    classifier : estimator
+        A fitted classifier implementing `predict_proba`.
+    X_test : array-like of shape (n_samples, n_features)
+        The testing data.
+    y_test : array-like of shape (n_samples,)
+        The testing target.
+    pos_label : str or int
+        The label of the positive class.
+    """
+
+    def __init__(self, classifier, X_test, y_test, pos_label):
+        from sklearn.metrics import (
+            average_precision_score, precision_recall_curve, roc_auc_score,
+            roc_curve)
+
+        self.pos_label = pos_label
+        classes = np.asarray(classifier.classes_)
+        pos_idx = np.flatnonzero(classes == pos_label)[0]
+        # labels of the negative and positive classes, in this order
+        self.labels = classes[[int(not bool(pos_idx)), pos_idx]]
+
+        y_score = classifier.predict_proba(X_test)[:, pos_idx]
+        y_true = np.asarray(y_test) == pos_label
+
+        self.precision, self.recall, self.pr_thresholds = (
+            precision_recall_curve(y_true, y_score))
+        self.average_precision = average_precision_score(y_true, y_score)
+        self.fpr, self.tpr, self.roc_thresholds = roc_curve(y_true, y_score)
+        self.roc_auc = roc_auc_score(y_true, y_score)
+        self._compute_confusion_matrices(y_true, y_score)
+        self.fig = None
+
+    def _compute_confusion_matrices(self, y_true, y_score):
+        """Compute the confusion matrix of every distinct threshold.
+
+        A sample is predicted as positive when its score is strictly above
+        the threshold. Sorting the scores once, the number of positive and
+        negative samples whose score is below each distinct score is given
+        by a cumulative sum.
+        """
+        order = np.argsort(y_score, kind="mergesort")
+        sorted_score, sorted_true = y_score[order], y_true[order]
+        # position of the last occurrence of each distinct score
+        last = np.r_[np.flatnonzero(np.diff(sorted_score)),
+                     len(sorted_score) - 1]
+        self._distinct_scores = sorted_score[last]
+
+        n_pos = y_true.sum()
+        n_neg = len(y_true) - n_pos
+        # prepend the case of a threshold below all the scores
+        fn = np.r_[0, np.cumsum(sorted_true)[last]]
+        tn = np.r_[0, last + 1 - fn[1:]]
+        self._confusion_matrices = np.stack(
+            [np.stack([tn, n_neg - tn], axis=1),
+             np.stack([fn, n_pos - fn], axis=1)],
+            axis=1,
+        )
+
+    def confusion_matrix(self, threshold):
+        """Confusion matrix obtained when thresholding at `threshold`.
+
+        Rows are the true labels and columns the predicted labels, ordered
+        as in `labels`.
+        """
+        idx = np.searchsorted(self._distinct_scores, threshold, side="right")
+        return self._confusion_matrices[idx]
+
+    def _markers_position(self, threshold):
+        pr_idx = np.searchsorted(self.pr_thresholds, threshold)
+        # ROC thresholds are sorted in decreasing order
+        roc_idx = len(self.roc_thresholds) - 1 - np.searchsorted(
+            self.roc_thresholds[::-1], threshold)
+        return ((self.recall[pr_idx], self.precision[pr_idx]),
+                (self.fpr[roc_idx], self.tpr[roc_idx]))
+
+    def plot(self, threshold=0.5):
+        """Create the figure with the curves and the confusion matrix."""
+        import matplotlib
+
+        if "inline" in matplotlib.get_backend():
+            # the inline backend cannot redraw a figure already displayed:
+            # keep the figure out of pyplot and display it at each update
+            from matplotlib.figure import Figure
+            self.fig = Figure(figsize=(21, 6))
+            axs = self.fig.subplots(ncols=3)
+        else:
+            self.fig, axs = plt.subplots(ncols=3, figsize=(21, 6))
+        pr_ax, roc_ax, cm_ax = axs
+
+        pr_ax.plot(self.recall, self.precision, color="tab:orange",
+                   linewidth=3,
+                   label=f"Average Precision: {self.average_precision:.2f}")
+        pr_ax.set_xlabel("Recall")
+        pr_ax.set_ylabel("Precision")
+
+        roc_ax.plot(self.fpr, self.tpr, color="tab:orange", linewidth=3,
+                    label=f"ROC-AUC: {self.roc_auc:.2f}")
+        roc_ax.plot([0, 1], [0, 1], "--", color="tab:green", label="Chance")
+        roc_ax.set_xlabel("1 - Specificity")
+        roc_ax.set_ylabel("Sensitivity")
+
+        # a marker and its projection on both axes
+        self._markers = []
+        for ax in (pr_ax, roc_ax):
+            marker, = ax.plot([], [], color="tab:blue", marker=".",
+                              markersize=10)
+            vline, = ax.plot([], [], "--", color="tab:blue")
+            hline, = ax.plot([], [], "--", color="tab:blue")
+            self._markers.append((marker, vline, hline))
+            ax.set_xlim([0, 1])
+            ax.set_ylim([0, 1])
+            ax.legend()
+
+        cm = self.confusion_matrix(threshold)
+        self._image = cm_ax.imshow(cm, interpolation="nearest")
+        self._texts = [[cm_ax.text(j, i, "", ha="center", va="center")
+                        for j in range(2)] for i in range(2)]
+        cm_ax.set(xticks=np.arange(2), yticks=np.arange(2),
+                  xticklabels=self.labels, yticklabels=self.labels,
+                  ylabel="True label", xlabel="Predicted label")
+        self.fig.suptitle(
+            f"Overall performance with positive class '{self.pos_label}'")
+        self.update(threshold)
+        return self.fig
+
+    def update(self, threshold):
+        """Move the markers and update the confusion matrix."""
+        if self.fig is None:
+            self.plot(threshold)
+            return
+
+        for (x, y), (marker, vline, hline) in zip(
+                self._markers_position(threshold), self._markers):
+            marker.set_data([x], [y])
+            vline.set_data([x, x], [0, y])
+            hline.set_data([0, x], [y, y])
+
+        cm = self.confusion_matrix(threshold)
+        self._image.set_data(cm)
+        self._image.set_clim(cm.min(), cm.max())
+        cmap_min, cmap_max = self._image.cmap(0), self._image.cmap(256)
+        # print text with appropriate color depending on background
+        color_threshold = (cm.max() + cm.min()) / 2.0
+        for i in range(2):
+            for j in range(2):
+                self._texts[i][j].set_text(format(cm[i, j], "d"))
+                self._texts[i][j].set_color(
+                    cmap_max if cm[i, j] < color_threshold else cmap_min)
+
+        if self.fig.canvas.manager is not None:
+            self.fig.canvas.draw_idle()
+
+    def interactive(self):
+        """Return a widget with a slider controlling the threshold."""
+        from ipywidgets import interactive, FloatSlider
+        from IPython.display import display
+
+        def on_change(threshold):
+            self.update(threshold)
+            if self.fig.canvas.manager is None:
+                # figure not managed by pyplot, e.g. with the inline backend
+                display(self.fig)
+
+        slider = FloatSlider(min=0, max=1, step=0.01, value=0.5)
+        return interactive(on_change, threshold=slider)
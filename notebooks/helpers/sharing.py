@@ -0,0 +1,108 @@
+"""
+Sharing datasets with the worker processes of joblib without copies.
+
+When a function such as `cross_validate` or `GridSearchCV` is called with
+`n_jobs`, joblib sends the data to the worker processes for each task. Large
+arrays are dumped to a temporary memory-mapped file, but this file is
+written, and the array hashed, for each call. The function `share_data`
+stores the numerical data once in a memory-mapped file, in `/dev/shm` when
+available, and returns dataframes and arrays backed by this file. joblib
+then only sends the name of the file to the workers, which map the same
+memory instead of receiving a copy.
+
+A block of `multiprocessing.shared_memory` would not avoid the copies: joblib
+pickles the arrays backed by it like any other array, while it recognizes
+the memory-mapped arrays and reuses them as they are.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_SHARED_FOLDER = None
+
+
+def _shared_folder():
+    """Folder of the shared files, removed when the interpreter exits."""
+    global _SHARED_FOLDER
+    if _SHARED_FOLDER is None:
+        # /dev/shm is backed by memory on Linux
+        parent = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+        _SHARED_FOLDER = Path(
+            tempfile.mkdtemp(prefix="sklearn-mooc-", dir=parent))
+        atexit.register(shutil.rmtree, _SHARED_FOLDER, ignore_errors=True)
+    return _SHARED_FOLDER
+
+
+def _share_array(array):
+    """Copy `array` into a new shared file and return it memory-mapped."""
+    path = _shared_folder() / f"{uuid.uuid4().hex}.npy"
+    with open(path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+    return np.load(path, mmap_mode="r")
+
+
+def _share_columns(values):
+    """Share a 2D array such that its columns are contiguous.
+
+    The transposed array is stored: its transpose is then the memory-mapped
+    array itself in the blocks of a dataframe, which joblib sends to the
+    workers as is.
+    """
+    return _share_array(values.T).T
+
+
+def _is_numeric(dtype):
+    return isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+
+
+def _share_frame(df):
+    dtypes = set(df.dtypes)
+    if len(dtypes) == 1 and _is_numeric(next(iter(dtypes))):
+        return pd.DataFrame(_share_columns(df.to_numpy()), index=df.index,
+                            columns=df.columns, copy=False)
+    # share the numerical columns only, one at a time to keep their order
+    columns = [
+        pd.DataFrame(_share_columns(df[[name]].to_numpy()), index=df.index,
+                     columns=[name], copy=False)
+        if _is_numeric(dtype) else df[[name]]
+        for name, dtype in df.dtypes.items()]
+    return pd.concat(columns, axis=1)
+
+
+def share_data(*arrays):
+    """Back the numerical data of arrays with a shared memory-mapped file.
+
+    The returned dataframes, series and arrays have the same content as the
+    given ones, but their numerical data is read-only and stored in a file
+    which the joblib workers map instead of receiving a copy of the data.
+    The other columns, e.g. strings, are left in memory and sent to the
+    workers as usual. The files are removed when the Python process exits.
+
+    Parameters
+    ----------
+    *arrays : dataframes, series or ndarrays
+        The data to share, e.g. `X` and `y`.
+
+    Returns
+    -------
+    shared : dataframe, series or ndarray, or tuple of them
+        The shared data, in the same order as `arrays`.
+    """
+    shared = []
+    for array in arrays:
+        if isinstance(array, pd.DataFrame):
+            array = _share_frame(array)
+        elif isinstance(array, pd.Series) and _is_numeric(array.dtype):
+            array = pd.Series(_share_array(array.to_numpy()),
+                              index=array.index, name=array.name, copy=False)
+        elif isinstance(array, np.ndarray) and _is_numeric(array.dtype):
+            array = _share_array(array)
+        shared.append(array)
+    return tuple(shared) if len(shared) > 1 else shared[0]
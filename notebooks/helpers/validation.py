@@ -0,0 +1,300 @@
+"""
+Validation curves computed without refitting a model for each parameter.
+"""
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.model_selection import check_cv
+
+
+def _subset(X, indices):
+    return X.iloc[indices] if hasattr(X, "iloc") else X[indices]
+
+
+def _nodes_by_depth(tree, X, max_depth):
+    """Node reached by each sample at each depth of a fitted tree.
+
+    Column `d` holds the node where each sample stands after `d` splits.
+    Samples reaching a leaf before depth `d` stay in this leaf.
+    """
+    tree_ = tree.tree_
+    # the trees compare the features in single precision
+    X = np.asarray(X, dtype=np.float32)
+    rows = np.arange(X.shape[0])
+    nodes = np.zeros((X.shape[0], max_depth + 1), dtype=np.intp)
+    current = nodes[:, 0]
+    for depth in range(1, max_depth + 1):
+        current = current.copy()
+        internal = tree_.children_left[current] != -1
+        if not internal.any():
+            nodes[:, depth:] = current[:, np.newaxis]
+            break
+        node = current[internal]
+        go_left = (X[rows[internal], tree_.feature[node]]
+                   <= tree_.threshold[node])
+        current[internal] = np.where(go_left, tree_.children_left[node],
+                                     tree_.children_right[node])
+        nodes[:, depth] = current
+    return nodes
+
+
+def _node_pruning_alphas(tree):
+    """Value of `ccp_alpha` from which each node of a fitted tree is pruned.
+
+    This replays the minimal cost-complexity pruning of scikit-learn: the
+    internal node whose subtree decreases the least the total impurity per
+    additional leaf, the weakest link, is turned into a leaf; this is
+    repeated until only the root is left. The value returned for a node is
+    the smallest `ccp_alpha` for which it is a leaf of the pruned tree, or
+    is pruned with one of its ancestors. It is `-inf` for the leaves of
+    `tree` and it never increases from a node to its children.
+    """
+    tree_ = tree.tree_
+    left, right = tree_.children_left, tree_.children_right
+    n_nodes = tree_.node_count
+    internal = left != -1
+    parent = np.full(n_nodes, -1)
+    parent[left[internal]] = np.flatnonzero(internal)
+    parent[right[internal]] = np.flatnonzero(internal)
+
+    # pre-order traversal: the subtree of a node is a slice of `order`
+    order, stack = [], [0]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if internal[node]:
+            stack.extend((right[node], left[node]))
+    order = np.array(order)
+    start = np.empty(n_nodes, dtype=np.intp)
+    start[order] = np.arange(n_nodes)
+    end = start + 1
+    for node in order[::-1]:
+        if internal[node]:
+            end[node] = end[right[node]]
+
+    # impurity of each node weighted by its proportion of samples, and
+    # impurity and number of leaves of the current subtree of each node
+    risk = (tree_.impurity * tree_.weighted_n_node_samples
+            / tree_.weighted_n_node_samples[0])
+    subtree_risk, n_leaves = risk.copy(), np.ones(n_nodes)
+    for node in order[::-1]:
+        if internal[node]:
+            subtree_risk[node] = (
+                subtree_risk[left[node]] + subtree_risk[right[node]])
+            n_leaves[node] = n_leaves[left[node]] + n_leaves[right[node]]
+
+    pruning_alphas = np.full(n_nodes, -np.inf)
+    active = internal.copy()
+    while active.any():
+        candidates = np.flatnonzero(active)
+        effective_alphas = (
+            (risk[candidates] - subtree_risk[candidates])
+            / (n_leaves[candidates] - 1))
+        alpha = effective_alphas.min()
+        weakest = candidates[effective_alphas <= alpha]
+        # ancestors first: their descendants are pruned with them
+        for node in weakest[np.argsort(start[weakest])]:
+            if not active[node]:
+                continue
+            subtree = order[start[node]:end[node]]
+            pruning_alphas[subtree[active[subtree]]] = alpha
+            active[subtree] = False
+            delta_risk = risk[node] - subtree_risk[node]
+            delta_leaves = n_leaves[node] - 1
+            ancestor = parent[node]
+            while ancestor != -1:
+                subtree_risk[ancestor] += delta_risk
+                n_leaves[ancestor] -= delta_leaves
+                ancestor = parent[ancestor]
+            subtree_risk[node], n_leaves[node] = risk[node], 1
+    return pruning_alphas
+
+
+def _predict_truncated(tree, nodes):
+    """Predictions of the tree when stopping at the given nodes."""
+    value = tree.tree_.value[nodes, 0]
+    if is_classifier(tree):
+        return tree.classes_[np.argmax(value, axis=-1)]
+    return value[..., 0]
+
+
+def _tree_depths_scores(estimator, X, y, train, test, depths, score_func):
+    max_depth = max(depths)
+    tree = clone(estimator).set_params(max_depth=max_depth)
+    tree.fit(_subset(X, train), _subset(y, train))
+    scores = []
+    for indices in (train, test):
+        nodes = _nodes_by_depth(tree, _subset(X, indices), max_depth)
+        y_true = np.asarray(_subset(y, indices))
+        scores.append([
+            score_func(y_true, _predict_truncated(tree, nodes[:, depth]))
+            for depth in depths])
+    return scores
+
+
+def tree_depth_validation_curve(estimator, X, y, depths, cv=None,
+                                score_func=None, n_jobs=None):
+    """Validation curve of the `max_depth` of a decision tree.
+
+    Instead of fitting a tree for each depth of `depths`, a single tree is
+    grown on each training set up to the largest depth. The predictions of
+    the tree limited to a smaller depth are given by the node reached by
+    each sample at this depth, since its internal nodes store the mean
+    target (or the class distribution) of their training samples.
+
+    The tree of a given depth might differ from the one obtained by fitting
+    with `max_depth` when several splits are equally good: the tie is then
+    broken at random. The scores have the same distribution.
+
+    Parameters
+    ----------
+    estimator : DecisionTreeRegressor or DecisionTreeClassifier
+        The tree whose depth is evaluated. Its other parameters are kept.
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,)
+        The target.
+    depths : list of int
+        The values of `max_depth` to evaluate.
+    cv : int or cross-validation generator, default=None
+        The cross-validation strategy, 5-fold by default.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)`. By default,
+        the metric of `estimator.score`: the accuracy for classifiers and the
+        R2 score for regressors.
+    n_jobs : int, default=None
+        Number of jobs fitting the trees in parallel.
+
+    Returns
+    -------
+    train_scores : ndarray of shape (n_depths, n_splits)
+        Scores on the training sets.
+    test_scores : ndarray of shape (n_depths, n_splits)
+        Scores on the testing sets.
+    """
+    if score_func is None:
+        score_func = accuracy_score if is_classifier(estimator) else r2_score
+    cv = check_cv(cv, y, classifier=is_classifier(estimator))
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_tree_depths_scores)(
+            estimator, X, y, train, test, depths, score_func)
+        for train, test in cv.split(X, y))
+    # shape (n_splits, 2, n_depths) to the layout of `validation_curve`
+    train_scores, test_scores = np.array(scores).transpose(1, 2, 0)
+    return train_scores, test_scores
+
+
+def _staged_predictions(ensemble, X, sizes):
+    """Predictions of the first `size` estimators of `ensemble`, per size.
+
+    Boosting ensembles provide them with `staged_predict`. For the other
+    ensembles, e.g. forests and bagging, the predictions (or probabilities)
+    of the estimators are accumulated in a running sum. `sizes` must be
+    sorted in increasing order. An ensemble which stopped adding estimators
+    early gives its final predictions for the larger sizes.
+    """
+    if hasattr(ensemble, "staged_predict"):
+        stages = ensemble.staged_predict(X)
+        n_estimators, y_pred = 0, None
+        for size in sizes:
+            if n_estimators < size:
+                for y_pred in stages:
+                    n_estimators += 1
+                    if n_estimators == size:
+                        break
+            yield y_pred
+        return
+
+    classifier = is_classifier(ensemble)
+    # the estimators of the ensembles are fitted on arrays
+    X = np.asarray(X)
+    features = getattr(ensemble, "estimators_features_", None)
+    n_estimators, total = 0, 0.
+    for size in sizes:
+        while n_estimators < min(size, len(ensemble.estimators_)):
+            estimator = ensemble.estimators_[n_estimators]
+            X_estimator = (
+                X if features is None else X[:, features[n_estimators]])
+            if classifier:
+                # an estimator might not have seen all the classes, which
+                # are encoded as integers by the ensemble
+                proba = np.zeros((X.shape[0], len(ensemble.classes_)))
+                proba[:, estimator.classes_.astype(int)] = (
+                    estimator.predict_proba(X_estimator))
+                total = total + proba
+            else:
+                total = total + estimator.predict(X_estimator)
+            n_estimators += 1
+        if classifier:
+            yield ensemble.classes_[np.argmax(total, axis=1)]
+        else:
+            yield total / n_estimators
+
+
+def _ensemble_sizes_scores(estimator, X, y, train, test, sizes,
+                           score_func):
+    ensemble = clone(estimator).set_params(n_estimators=max(sizes))
+    ensemble.fit(_subset(X, train), _subset(y, train))
+    order = np.argsort(sizes)
+    scores = []
+    for indices in (train, test):
+        y_true = np.asarray(_subset(y, indices))
+        subset_scores = np.empty(len(sizes))
+        subset_scores[order] = [
+            score_func(y_true, y_pred) for y_pred in _staged_predictions(
+                ensemble, _subset(X, indices), np.asarray(sizes)[order])]
+        scores.append(subset_scores)
+    return scores
+
+
+def ensemble_size_validation_curve(estimator, X, y, n_estimators, cv=None,
+                                   score_func=None, n_jobs=None):
+    """Validation curve of the number of estimators of an ensemble.
+
+    Instead of fitting an ensemble for each value of `n_estimators`, a
+    single ensemble with the largest number of estimators is fitted on each
+    training set. Since the estimators are added one after the other, the
+    ensemble limited to its first estimators is the ensemble which would
+    have been fitted with fewer estimators (with the same `random_state`).
+    Its predictions are obtained with `staged_predict` for the boosting
+    ensembles and by averaging the predictions of the first estimators for
+    the other ensembles, as forests or bagging.
+
+    Parameters
+    ----------
+    estimator : ensemble estimator
+        The ensemble whose number of estimators is evaluated. Its other
+        parameters are kept.
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,)
+        The target.
+    n_estimators : list of int
+        The values of `n_estimators` to evaluate.
+    cv : int or cross-validation generator, default=None
+        The cross-validation strategy, 5-fold by default.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)`. By default,
+        the metric of `estimator.score`: the accuracy for classifiers and the
+        R2 score for regressors.
+    n_jobs : int, default=None
+        Number of jobs fitting the ensembles in parallel.
+
+    Returns
+    -------
+    train_scores : ndarray of shape (n_values, n_splits)
+        Scores on the training sets.
+    test_scores : ndarray of shape (n_values, n_splits)
+        Scores on the testing sets.
+    """
+    if score_func is None:
+        score_func = accuracy_score if is_classifier(estimator) else r2_score
+    cv = check_cv(cv, y, classifier=is_classifier(estimator))
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_ensemble_sizes_scores)(
+            estimator, X, y, train, test, n_estimators, score_func)
+        for train, test in cv.split(X, y))
+    train_scores, test_scores = np.array(scores).transpose(1, 2, 0)
+    return train_scores, test_scores
@@ -29,12 +29,16 @@
 # ## Loading the adult census dataset
 #
 # We will use data from the "Current Population adult_census" from 1994 that we
-# downloaded from [OpenML](http://openml.org/).
+# downloaded from [OpenML](http://openml.org/). The `load_dataset` helper reads
+# the CSV file with `pd.read_csv` and keeps a binary copy of it such that
+# subsequent loads are faster.
 
 # %%
 import pandas as pd
 
-adult_census = pd.read_csv("../datasets/adult-census.csv")
+from helpers.datasets import load_dataset
+
+adult_census = load_dataset("adult-census")
 
 # %% [markdown]
 # We can look at the OpenML webpage to learn more about this dataset:
@@ -30,9 +30,9 @@
 # models.
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 # %% [markdown]
 # We will first split our dataset to have the target separated from the data
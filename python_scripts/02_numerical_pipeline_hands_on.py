@@ -22,9 +22,9 @@
 # a dataframe.
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 df.head()
 
 # %% [markdown]
@@ -34,7 +34,9 @@
 # %%
 import pandas as pd
 
-df = pd.read_csv("../datasets/adult-census.csv")
+from helpers.datasets import load_dataset
+
+df = load_dataset("adult-census")
 
 # %% [markdown]
 # We will first split our dataset to have the target separated from the data
@@ -228,9 +230,43 @@ print(f"The mean cross-validation accuracy is: "
 # trained to the full training set, along with an estimate of the variability
 # (uncertainty on the generalization accuracy).
 
+# %% [markdown]
+# ## Learning from data that does not fit in memory
+#
+# Both the scaler and the logistic regression above need the whole dataset in
+# memory. When the data is too large, the model can instead be fitted
+# "out-of-core": the file is read by chunks of rows, and the model is updated
+# with each chunk by its `partial_fit` method. The `StandardScaler` can update
+# its running mean and variance this way, and the `SGDClassifier` fits a
+# logistic regression by stochastic gradient descent. The helper
+# `StreamingClassifier` chains both, and `iter_csv_chunks` reads a CSV file
+# by chunks. Only a chunk is in memory at a time, whatever the size of the
+# file.
+#
+# The model can be evaluated along the way: each new chunk is first used to
+# score the model fitted on the previous chunks, and then to update it. This
+# is called progressive validation.
+
+# %%
+from helpers.streaming import (
+    StreamingClassifier, iter_csv_chunks, progressive_validation)
+
+streaming_model = StreamingClassifier(
+    classes=[" <=50K", " >50K"], random_state=0)
+chunks = iter_csv_chunks("adult-census-numeric-all", chunksize=5_000)
+progressive_scores = progressive_validation(streaming_model, chunks)
+progressive_scores
+
+# %% [markdown]
+# The accuracy tends to improve as more chunks are seen. The model makes a
+# single pass over the data: it is only slightly less accurate than the
+# logistic regression fitted in memory, which iterates over the whole dataset
+# until convergence.
+
 # %% [markdown]
 # In this notebook we have:
 #
 # * seen the importance of **scaling numerical variables**;
 # * used a **pipeline** to chain scaling and logistic regression training;
-# * assessed the performance of our model via **cross-validation**.
+# * assessed the performance of our model via **cross-validation**;
+# * fitted and evaluated a model **out-of-core**, one chunk of data at a time.
@@ -25,7 +25,9 @@
 # %%
 import pandas as pd
 
-df = pd.read_csv("../datasets/adult-census.csv")
+from helpers.datasets import load_dataset
+
+df = load_dataset("adult-census")
 
 target_name = "class"
 target = df[target_name]
@@ -30,9 +30,9 @@
 # sparse=False)` to force the use a dense representation as a workaround.
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 # %%
 target_name = "class"
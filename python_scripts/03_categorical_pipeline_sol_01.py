@@ -36,9 +36,9 @@
 # ```
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 # %%
 target_name = "class"
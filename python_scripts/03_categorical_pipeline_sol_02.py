@@ -26,9 +26,9 @@
 #   one-hot encoded categories.
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 # %%
 target_name = "class"
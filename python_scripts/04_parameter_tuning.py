@@ -29,9 +29,9 @@
 # as previously done in previous notebooks.
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 # %%
 target_name = "class"
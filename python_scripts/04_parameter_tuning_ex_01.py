@@ -24,11 +24,11 @@
 # 20%).
 
 # %%
-import pandas as pd
+from helpers.datasets import load_dataset
 
 from sklearn.model_selection import train_test_split
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 target_name = "class"
 target = df[target_name]
@@ -24,9 +24,9 @@
 
 # %%
 import numpy as np
-import pandas as pd
+from helpers.datasets import load_dataset
 
-df = pd.read_csv("../datasets/adult-census.csv")
+df = load_dataset("adult-census")
 
 target_name = "class"
 target = df[target_name]
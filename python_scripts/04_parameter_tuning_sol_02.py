@@ -26,7 +26,9 @@
 import numpy as np
 import pandas as pd
 
-df = pd.read_csv("../datasets/adult-census.csv")
+from helpers.datasets import load_dataset
+
+df = load_dataset("adult-census")
 
 target_name = "class"
 target = df[target_name]
@@ -37,6 +39,12 @@ from sklearn.model_selection import train_test_split
 df_train, df_test, target_train, target_test = train_test_split(
     data, target, train_size=0.2, random_state=42)
 
+from helpers.sharing import share_data
+
+# the searches below send the training data to parallel workers: store it
+# once in shared memory rather than copying it for each task
+df_train, target_train = share_data(df_train, target_train)
+
 # %% [markdown]
 # You should:
 # * preprocess the categorical columns using a `OneHotEncoder` and use a
@@ -111,6 +119,8 @@ model = make_pipeline(preprocessor, LogisticRegression())
 from sklearn.model_selection import RandomizedSearchCV
 from scipy.stats import reciprocal
 
+from helpers.smoke import smoke_cap
+
 param_distributions = {
     "logisticregression__C": reciprocal(0.001, 10),
     "logisticregression__solver": ["liblinear", "lbfgs"],
@@ -120,10 +130,28 @@ param_distributions = {
 
 model_random_search = RandomizedSearchCV(
     model, param_distributions=param_distributions,
-    n_iter=20, error_score=np.nan, n_jobs=2, verbose=1)
+    n_iter=smoke_cap(20, 2), error_score=np.nan, n_jobs=2, verbose=1)
 model_random_search.fit(df_train, target_train)
 model_random_search.best_params_
 
+# %% [markdown]
+# Going further: with a successive halving strategy, the candidates are
+# first evaluated on a small subsample of the training set and only the most
+# promising ones are evaluated on larger subsamples. The search below
+# evaluates 5 times more candidates than the random search above, for a cost
+# only about twice as large.
+
+# %%
+from sklearn.experimental import enable_halving_search_cv  # noqa
+from sklearn.model_selection import HalvingRandomSearchCV
+
+model_halving_search = HalvingRandomSearchCV(
+    model, param_distributions=param_distributions,
+    n_candidates=smoke_cap(100, 9), min_resources="exhaust",
+    error_score=np.nan, n_jobs=2, random_state=0)
+model_halving_search.fit(df_train, target_train)
+model_halving_search.best_params_
+
 # %% [markdown]
 # We could use `cv_results = model_random_search.cv_results_` in the plot at
 # the end of this notebook (you are more than welcome to try!). Instead we are
@@ -15,7 +15,7 @@
 # baselines. We will start by loading the california housing dataset.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 
@@ -24,29 +24,21 @@ X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 
 # %%
 from sklearn.model_selection import ShuffleSplit
+from helpers.smoke import smoke_cap
 
-cv = ShuffleSplit(n_splits=30, test_size=0.2, random_state=0)
+cv = ShuffleSplit(n_splits=smoke_cap(30, 3), test_size=0.2, random_state=0)
 
 # %% [markdown]
-# We will start by running the cross-validation for the decision tree
-# regressor which is our model of interest. Besides, we will store the
-# generalization error into a pandas series.
+# We will start by defining the decision tree regressor which is our model of
+# interest.
 
 # %%
-import pandas as pd
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.model_selection import cross_validate
 
 regressor = DecisionTreeRegressor()
-result_regressor = cross_validate(
-    regressor, X, y, cv=cv, scoring="neg_mean_absolute_error", n_jobs=-1
-)
-
-errors_regressor = pd.Series(
-    -result_regressor["test_score"], name="Regressor error")
 
 # %% [markdown]
-# Then, we will evaluate our first baseline. This baseline is called a dummy
+# Then, we will define our first baseline. This baseline is called a dummy
 # regressor. This dummy regressor will always predict the mean target computed
 # on the training. Therefore, the dummy regressor will never use any
 # information regarding the data `X`.
@@ -55,42 +47,48 @@ errors_regressor = pd.Series(
 from sklearn.dummy import DummyRegressor
 
 dummy = DummyRegressor()
-result_dummy = cross_validate(
-    dummy, X, y, cv=cv, scoring="neg_mean_absolute_error", n_jobs=-1
-)
-errors_dummy = pd.Series(-result_dummy["test_score"], name="Dummy error")
 
 # %% [markdown]
-# Finally, we will evaluate the performance of the second baseline. This
-# baseline will provide the performance of the chance level. Indeed, we will
-# train a decision tree on some training data and evaluate the same tree on
-# data where the target vector has been randomized.
+# Finally, the second baseline will provide the performance of the chance
+# level. Indeed, we will train a decision tree on some training data and
+# evaluate the same tree on data where the target vector has been randomized.
+# This is what `sklearn.model_selection.permutation_test_score` computes: the
+# model is cross-validated several times with the target randomly permuted.
+#
+# These three evaluations are independent and use the same cross-validation
+# splits. Instead of running `cross_validate` and `permutation_test_score` one
+# after the other, the helper `run_experiments` schedules all their fits at
+# once on the parallel workers, such that the comparison takes about the time
+# of its slowest member. It returns the scores in a single dataframe, with one
+# row per split or, for the permuted target, one row per permutation.
 
 # %%
-from sklearn.model_selection import permutation_test_score
-
-regressor = DecisionTreeRegressor()
-score, permutation_score, pvalue = permutation_test_score(
-    regressor, X, y, cv=cv, scoring="neg_mean_absolute_error", n_jobs=-1,
-    n_permutations=30)
-errors_permutation = pd.Series(-permutation_score, name="Permuted error")
+from helpers.experiments import run_experiments
+
+experiments = {
+    "Regressor error": regressor,
+    "Dummy error": dummy,
+    "Permuted error": {
+        "estimator": DecisionTreeRegressor(),
+        "n_permutations": smoke_cap(30, 3),
+    },
+}
+results = run_experiments(
+    experiments, X, y, cv=cv, scoring="neg_mean_absolute_error", n_jobs=-1,
+    random_state=0)
+results["error"] = -results["test_score"]
+results.head()
 
 # %% [markdown]
 # Finally, we plot the generalization errors for the two baselines and the
 # actual regressor.
 
-# %%
-final_errors = pd.concat(
-    [errors_regressor, errors_dummy, errors_permutation],
-    axis=1,
-)
-
 # %%
 import matplotlib.pyplot as plt
 import seaborn as sns
 sns.set_context("talk")
 
-sns.displot(final_errors, kind="kde")
+sns.displot(data=results, x="error", hue="experiment", kind="kde")
 _ = plt.xlabel("Mean absolute error (k$)")
 
 # %% [markdown]
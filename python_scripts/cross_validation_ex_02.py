@@ -10,7 +10,9 @@
 # %%
 import pandas as pd
 
-data = pd.read_csv("../datasets/adult-census-numeric-all.csv")
+from helpers.datasets import load_dataset
+
+data = load_dataset("adult-census-numeric-all")
 X, y = data.drop(columns="class"), data["class"]
 
 # %% [markdown]
@@ -111,7 +111,9 @@ print(f"The mean score using nested cross-validation is: "
 test_score_not_nested = []
 test_score_nested = []
 
-N_TRIALS = 20
+from helpers.smoke import smoke_cap
+
+N_TRIALS = smoke_cap(20, 2)
 for i in range(N_TRIALS):
     inner_cv = KFold(n_splits=4, shuffle=True, random_state=i)
     outer_cv = KFold(n_splits=4, shuffle=True, random_state=i)
@@ -10,17 +10,31 @@
 # %%
 import pandas as pd
 
-data = pd.read_csv("../datasets/adult-census-numeric-all.csv")
+from helpers.datasets import load_dataset
+
+data = load_dataset("adult-census-numeric-all")
 X, y = data.drop(columns="class"), data["class"]
 
+# %% [markdown]
+# We will evaluate several models with many cross-validation splits in
+# parallel. To avoid sending a copy of the data to the parallel workers for
+# each split, we store it once in shared memory with the helper `share_data`:
+# the workers then read the same memory.
+
+# %%
+from helpers.sharing import share_data
+
+X, y = share_data(X, y)
+
 # %% [markdown]
 # First, define a `ShuffleSplit` cross-validation strategy taking half of the
 # sample as a testing at each round.
 
 # %%
 from sklearn.model_selection import ShuffleSplit
+from helpers.smoke import smoke_cap
 
-cv = ShuffleSplit(n_splits=10, test_size=0.5, random_state=0)
+cv = ShuffleSplit(n_splits=smoke_cap(10, 3), test_size=0.5, random_state=0)
 
 # %% [markdown]
 # Next, create a machine learning pipeline composed of a transformer to
@@ -36,11 +50,17 @@ classifier = make_pipeline(StandardScaler(), LogisticRegression())
 # %% [markdown]
 # Get the test score by using the model, the data, and the cross-validation
 # strategy that you defined above.
+#
+# Since the splits of `cv` are seeded, this evaluation always gives the same
+# results. We therefore use the helper `cached_cross_validate`, a drop-in
+# replacement of `cross_validate` which stores the results on disk, keyed by
+# the model, the data, the splits and the scoring: executing the notebook
+# again loads them instead of fitting the models again.
 
 # %%
-from sklearn.model_selection import cross_validate
+from helpers.caching import cached_cross_validate
 
-result_classifier = cross_validate(classifier, X, y, cv=cv, n_jobs=-1)
+result_classifier = cached_cross_validate(classifier, X, y, cv=cv, n_jobs=-1)
 
 test_score_classifier = pd.Series(
     result_classifier["test_score"], name="Classifier score")
@@ -53,9 +73,30 @@ test_score_classifier = pd.Series(
 from sklearn.model_selection import permutation_test_score
 
 score, permutation_score, pvalue = permutation_test_score(
-    classifier, X, y, cv=cv, n_jobs=-1, n_permutations=10)
+    classifier, X, y, cv=cv, n_jobs=-1,
+    n_permutations=smoke_cap(10, 3))
 test_score_permutation = pd.Series(permutation_score, name="Permuted score")
 
+# %% [markdown]
+# With 10 permutations, the p-value cannot be smaller than 1 / 11, above the
+# usual significance level of 5%. The helper `permutation_test` splits the
+# data once for all the permutations and draws them by batches: it stops as
+# soon as the p-value is known to be below, or above, the significance level.
+# To keep this check cheap, we use 3 splits and check whether to stop after
+# each batch of 20 permutations: about a hundred permutations are enough to
+# conclude that the model is better than chance.
+
+# %%
+from helpers.permutation import permutation_test
+
+score, permutation_score_many, pvalue = permutation_test(
+    classifier, X, y,
+    cv=ShuffleSplit(n_splits=3, test_size=0.5, random_state=0),
+    n_permutations=smoke_cap(1000, 20), batch_size=20, n_jobs=-1,
+    random_state=0)
+print(f"p-value with {len(permutation_score_many)} permutations: "
+      f"{pvalue:.4f}")
+
 # %% [markdown]
 # Finally, compute the test score of a dummy classifier which would predict
 # the most frequent class from the training set. You can look at the
@@ -65,7 +106,7 @@ test_score_permutation = pd.Series(permutation_score, name="Permuted score")
 from sklearn.dummy import DummyClassifier
 
 dummy = DummyClassifier(strategy="most_frequent")
-result_dummy = cross_validate(dummy, X, y, cv=cv, n_jobs=-1)
+result_dummy = cached_cross_validate(dummy, X, y, cv=cv, n_jobs=-1)
 test_score_dummy = pd.Series(result_dummy["test_score"], name="Dummy score")
 
 # %% [markdown]
@@ -103,6 +144,9 @@ _ = plt.xlabel("Accuracy (%)")
 # why the results get worse.
 
 # %%
+from sklearn.model_selection import cross_validate
+
+# the stratified strategy is random and not seeded: do not cache its results
 dummy = DummyClassifier(strategy="stratified")
 result_dummy_stratify = cross_validate(dummy, X, y, cv=cv, n_jobs=-1)
 test_score_dummy_stratify = pd.Series(
@@ -33,7 +33,7 @@
 # the median income of people in the neighborhoods (block).
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 import pandas as pd
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
@@ -210,18 +210,26 @@ plt.subplots_adjust(left=.3)
 # If coefficients vary significantly when changing the input dataset their
 # robustness is not guaranteed, and they should probably be interpreted with
 # caution.
+#
+# Fitting a ridge model only requires a few statistics of the data: the sums
+# of the features and of the target, $X^T X$ and $X^T y$. The function
+# `ridge_cross_validate` of our `helpers` module computes them once on each
+# testing set and derives those of the training sets by subtraction, instead
+# of fitting a new pipeline on each training set. We use the regularization
+# strength `alpha` selected by `RidgeCV` above for all the splits.
 
 # %%
-from sklearn.model_selection import cross_validate
 from sklearn.model_selection import RepeatedKFold
+from helpers.linear_models import ridge_cross_validate
+from helpers.smoke import smoke_cap
 
-cv_model = cross_validate(
-   model, X_with_rnd_feat, y, cv=RepeatedKFold(n_splits=5, n_repeats=5),
-   return_estimator=True, n_jobs=-1
+cv_model = ridge_cross_validate(
+   X_with_rnd_feat, y,
+   cv=RepeatedKFold(n_splits=5, n_repeats=smoke_cap(5, 1)),
+   alpha=model[1].alpha_, scale=True
 )
 coefs = pd.DataFrame(
-   [model[1].coef_
-    for model in cv_model['estimator']],
+   cv_model['coef'],
    columns=X_with_rnd_feat.columns
 )
 plt.figure(figsize=(9, 7))
@@ -467,10 +475,22 @@ def plot_importantes_features(perm_importance_result, feat_name):
 
 # %% [markdown]
 # Let's compute the feature importance by permutation on the training data.
+#
+# Our function above copies the full dataset for each feature and each
+# repetition, and recomputes the baseline score each time. The function
+# `permutation_importance` of `helpers.inspection` computes the same
+# importances, but computes the baseline score once, permutes the columns
+# in place in a single copy of the data and spreads the features over several
+# processes with `n_jobs`. We import it as `fast_permutation_importance` to
+# keep our own function available.
 
 # %%
-perm_importance_result_train = permutation_importance(
-    model, X_train, y_train, n_repeats=10)
+from helpers.inspection import (
+    permutation_importance as fast_permutation_importance)
+
+perm_importance_result_train = fast_permutation_importance(
+    model, X_train, y_train, n_repeats=smoke_cap(10, 2), n_jobs=2,
+    random_state=0)
 
 plot_importantes_features(perm_importance_result_train, X_train.columns)
 
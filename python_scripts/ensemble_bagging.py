@@ -109,16 +109,22 @@ for marker, bootstrap_idx in zip(["o", "^", "x"], range(n_bootstrap)):
 # confirm this intuition, we can check the number of unique samples in the
 # bootstrap samples.
 
+# %% [markdown]
+# We need a larger dataset to have a good estimate. Rather than copying the
+# data of the bootstrap sample, we only count how many times each sample is
+# drawn, using the helper `bootstrap_counts`: a bootstrap sample is then a
+# vector of counts, whose entries are 0 for the samples left out.
+
 # %%
-# we need to generate a larger set to have a good estimate
-X_huge_train, y_huge_train, X_test_huge = generate_data(n_samples=10000)
-X_bootstrap_sample, y_bootstrap_sample = bootstrap_sample(
-    X_huge_train, y_huge_train)
+from helpers.bootstrap import bootstrap_counts
+from helpers.smoke import smoke_cap
+
+n_huge_samples = smoke_cap(1_000_000, 10_000)
+counts = next(bootstrap_counts(n_huge_samples, n_bootstrap=1, random_state=0))
 
 print(
     f"Percentage of samples present in the original dataset: "
-    f"{np.unique(X_bootstrap_sample).size / X_bootstrap_sample.size * 100:.1f}"
-    f"%"
+    f"{np.mean(counts > 0) * 100:.1f}%"
 )
 
 # %% [markdown]
@@ -129,6 +135,12 @@ print(
 # So, we are able to generate many datasets, all slightly different. Now, we
 # can fit a decision tree to each of these datasets and each decision
 # tree shall be slightly different as well.
+#
+# Fitting a tree on a bootstrap sample is equivalent to fitting it on the
+# original dataset with the counts as sample weights: a sample drawn twice
+# weighs twice as much, and a sample left out has no weight. This avoids
+# copying the data for each tree. In the plots below, the size of the markers
+# is proportional to the counts.
 
 # %%
 _, axs = plt.subplots(
@@ -136,20 +148,20 @@ _, axs = plt.subplots(
 )
 
 forest = []
-for idx, (ax, _) in enumerate(zip(axs, range(n_bootstrap))):
-    X_bootstrap_sample, y_bootstrap_sample = bootstrap_sample(
-        X_train, y_train)
+all_counts = bootstrap_counts(len(y_train), n_bootstrap, random_state=rng)
+for idx, (ax, counts) in enumerate(zip(axs, all_counts)):
     forest.append(
         DecisionTreeRegressor(max_depth=3, random_state=0).fit(
-            X_bootstrap_sample, y_bootstrap_sample
+            X_train, y_train, sample_weight=counts
         )
     )
 
     y_pred = forest[-1].predict(X_test)
 
+    drawn = counts > 0
     sns.scatterplot(
-        x=X_bootstrap_sample["Feature"], y=y_bootstrap_sample, ax=ax,
-        color="black", alpha=0.5)
+        x=X_train["Feature"][drawn], y=y_train[drawn], size=counts[drawn],
+        ax=ax, color="black", alpha=0.5, legend=False)
     ax.plot(X_test, y_pred, linewidth=3, label="Fitted tree")
     ax.set_title(f"Bootstrap sample #{idx}")
     ax.legend()
@@ -179,14 +191,15 @@ _ = plt.legend()
 # %%
 ax = sns.scatterplot(
     x=X_train["Feature"], y=y_train, color="black", alpha=0.5)
-y_pred_forest = []
+# running mean of the predictions: the predictions of all the trees do not
+# need to be stored
+y_pred_forest = np.zeros(len(X_test))
 for tree_idx, tree in enumerate(forest):
     y_pred = tree.predict(X_test)
     ax.plot(X_test, y_pred, label=f"Tree #{tree_idx} predictions",
             linestyle="--", linewidth=3, alpha=0.8)
-    y_pred_forest.append(y_pred)
+    y_pred_forest += (y_pred - y_pred_forest) / (tree_idx + 1)
 
-y_pred_forest = np.mean(y_pred_forest, axis=0)
 ax.plot(X_test, y_pred_forest, label="Averaged predictions",
         linestyle="-", linewidth=3, alpha=0.8)
 _ = plt.legend()
@@ -195,6 +208,25 @@ _ = plt.legend()
 # The unbroken red line shows the averaged predictions, which would be the
 # final preditions given by our 'bag' of decision tree regressors.
 #
+# The helper `bagging_predict` combines both ideas: the trees are fitted with
+# bootstrap counts and their predictions are averaged as they are computed.
+# Each tree can be discarded once its predictions are added, such that the
+# memory used does not grow with the number of trees. We can use it to bag
+# many more trees on our dataset.
+
+# %%
+from helpers.bootstrap import bagging_predict
+
+y_pred_bagging = bagging_predict(
+    DecisionTreeRegressor(max_depth=3, random_state=0), X_train, y_train,
+    X_test, n_bootstrap=50, random_state=0)
+
+ax = sns.scatterplot(
+    x=X_train["Feature"], y=y_train, color="black", alpha=0.5)
+ax.plot(X_test, y_pred_bagging, label="Averaged predictions", linewidth=3)
+_ = plt.legend()
+
+# %% [markdown]
 # ## Bagging in scikit-learn
 #
 # Scikit-learn implements bagging estimators. It takes a base model that is the
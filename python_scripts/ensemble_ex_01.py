@@ -8,7 +8,7 @@
 # a testing set.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
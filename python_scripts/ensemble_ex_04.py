@@ -11,7 +11,7 @@
 # We will use california housing to conduct our experiments
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
@@ -217,7 +217,7 @@ print(f"Error of the tree: {y_true - y_pred_first_and_second_tree:.3f}")
 # the California housing dataset.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
@@ -226,8 +226,9 @@ X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
 # %%
 from time import time
 from sklearn.ensemble import GradientBoostingRegressor
+from helpers.smoke import smoke_cap
 
-gradient_boosting = GradientBoostingRegressor(n_estimators=200)
+gradient_boosting = GradientBoostingRegressor(n_estimators=smoke_cap(200, 10))
 
 start_time = time()
 gradient_boosting.fit(X_train, y_train)
@@ -245,7 +246,8 @@ print(f"Score time: {score_time_gradient_boosting:.5f} s\n")
 # %%
 from sklearn.ensemble import RandomForestRegressor
 
-random_forest = RandomForestRegressor(n_estimators=200, n_jobs=-1)
+random_forest = RandomForestRegressor(
+    n_estimators=smoke_cap(200, 10), n_jobs=-1)
 
 start_time = time()
 random_forest.fit(X_train, y_train)
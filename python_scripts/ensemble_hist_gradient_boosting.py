@@ -27,7 +27,7 @@
 # from scikit-learn. First, we will load the california housing dataset.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
@@ -39,8 +39,9 @@ X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
 # %%
 from time import time
 from sklearn.ensemble import GradientBoostingRegressor
+from helpers.smoke import smoke_cap
 
-gradient_boosting = GradientBoostingRegressor(n_estimators=200)
+gradient_boosting = GradientBoostingRegressor(n_estimators=smoke_cap(200, 10))
 
 start_time = time()
 gradient_boosting.fit(X_train, y_train)
@@ -90,7 +91,7 @@ X_trans
 from sklearn.pipeline import make_pipeline
 
 gradient_boosting = make_pipeline(
-    discretizer, GradientBoostingRegressor(n_estimators=200))
+    discretizer, GradientBoostingRegressor(n_estimators=smoke_cap(200, 10)))
 
 start_time = time()
 gradient_boosting.fit(X_train, y_train)
@@ -124,7 +125,7 @@ from sklearn.experimental import enable_hist_gradient_boosting
 from sklearn.ensemble import HistGradientBoostingRegressor
 
 histogram_gradient_boosting = HistGradientBoostingRegressor(
-    max_iter=200, random_state=0)
+    max_iter=smoke_cap(200, 10), random_state=0)
 
 start_time = time()
 histogram_gradient_boosting.fit(X_train, y_train)
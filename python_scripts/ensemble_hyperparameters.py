@@ -25,24 +25,42 @@
 # forest.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
+from helpers.sharing import share_data
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
+# store the training set once in shared memory for the parallel workers
+X_train, y_train = share_data(X_train, y_train)
+
+# %% [markdown]
+# Both the grid-search and the random forest can use several CPU cores
+# (`n_jobs=-1`). Nesting them would start as many threads per worker process
+# of the grid-search as there are cores: the cores would be oversubscribed.
+# The helper `plan_parallelism` instead splits the cores between the worker
+# processes, one per fit, and the threads of each forest, and reports the
+# chosen layout.
 
 # %%
 import pandas as pd
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import GridSearchCV, ParameterGrid
 from sklearn.ensemble import RandomForestRegressor
+from helpers.parallel import plan_parallelism
 
 param_grid = {
     "n_estimators": [10, 20, 30],
     "max_depth": [3, 5, None],
 }
+# one fit per candidate and per split of the 5-fold cross-validation
+n_fits = len(ParameterGrid(param_grid)) * 5
+plan = plan_parallelism(RandomForestRegressor(n_jobs=-1), n_tasks=n_fits)
+print(plan)
+
 grid_search = GridSearchCV(
-    RandomForestRegressor(n_jobs=-1), param_grid=param_grid, n_jobs=-1)
-grid_search.fit(X_train, y_train)
+    plan.estimator, param_grid=param_grid, n_jobs=plan.n_jobs)
+with plan:
+    grid_search.fit(X_train, y_train)
 
 columns = [f"param_{name}" for name in param_grid.keys()]
 columns += ["mean_test_score", "rank_test_score"]
@@ -53,6 +71,30 @@ cv_results[columns].sort_values(by="rank_test_score")
 # We can observe that in our grid-search, the largest `max_depth` together with
 # largest `n_estimators` led to the best performance.
 #
+# Since the trees of a random forest are fitted on bootstrap samples, each
+# candidate can instead be evaluated on its out-of-bag samples: the samples
+# left out of the bootstrap sample of a tree are predicted by this tree only.
+# Each candidate is then fitted once rather than once per cross-validation
+# fold. Only the scores are kept, and the best forest is fitted again on the
+# whole training set.
+
+# %%
+from helpers.search import OOBGridSearch
+
+oob_search = OOBGridSearch(
+    RandomForestRegressor(n_jobs=-1, random_state=0), param_grid=param_grid)
+oob_search.fit(X_train, y_train)
+
+cv_results = pd.DataFrame(oob_search.cv_results_)
+cv_results[columns].sort_values(by="rank_test_score")
+
+# %% [markdown]
+# The out-of-bag scores can be compared with the cross-validated scores above.
+# Each sample is only predicted by about a third of the trees: the out-of-bag
+# score is thus slightly pessimistic for the forests with few trees. With very
+# few trees, some samples are even in all the bootstrap samples and have no
+# out-of-bag prediction: they are left out of the score.
+#
 # ## Gradient-boosting decision tree
 #
 # For gradient-boosting, parameters are coupled, so we can not anymore set the
@@ -90,9 +132,12 @@ param_grid = {
     "max_depth": [3, 5, None],
     "learning_rate": [0.1, 1],
 }
+n_fits = len(ParameterGrid(param_grid)) * 5
+plan = plan_parallelism(GradientBoostingRegressor(), n_tasks=n_fits)
 grid_search = GridSearchCV(
-    GradientBoostingRegressor(), param_grid=param_grid, n_jobs=-1)
-grid_search.fit(X_train, y_train)
+    plan.estimator, param_grid=param_grid, n_jobs=plan.n_jobs)
+with plan:
+    grid_search.fit(X_train, y_train)
 
 columns = [f"param_{name}" for name in param_grid.keys()]
 columns += ["mean_test_score", "rank_test_score"]
@@ -10,7 +10,7 @@
 # in California based on demographic and geographic data.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
 
@@ -20,7 +20,7 @@
 # bagging regressor on the "California housing" dataset.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
@@ -31,13 +31,14 @@ X_train, X_test, y_train, y_test = train_test_split(
 from sklearn.ensemble import BaggingRegressor
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor
+from helpers.smoke import smoke_cap
 
 random_forest = RandomForestRegressor(
-    n_estimators=100, random_state=0, n_jobs=-1
+    n_estimators=smoke_cap(100, 10), random_state=0, n_jobs=-1
 )
 bagging = BaggingRegressor(
     base_estimator=DecisionTreeRegressor(random_state=0),
-    n_estimators=100,
+    n_estimators=smoke_cap(100, 10),
     n_jobs=-1,
 )
 
@@ -49,6 +50,22 @@ print(f"Performance of random forest: "
 print(f"Performance of bagging: "
       f"{bagging.score(X_test, y_test):.3f}")
 
+# %% [markdown]
+# Each tree of these ensembles is fitted on a bootstrap sample, which leaves
+# out about a third of the training samples. These "out-of-bag" samples can be
+# used to evaluate the ensemble: each sample is predicted only by the trees
+# which did not see it. This gives an estimate of the generalization
+# performance with a single fit, as a cross-validation would do with several
+# fits, and without holding out a testing set: the ensembles can be fitted on
+# the whole dataset.
+
+# %%
+from helpers.search import oob_score
+
+for name, model in [("random forest", random_forest), ("bagging", bagging)]:
+    score, _ = oob_score(model, X, y)
+    print(f"Out-of-bag performance of {name}: {score:.3f}")
+
 # %% [markdown]
 # Notice that we don't need to provide a `base_estimator` parameter to
 # `RandomForestRegressor`, it is always a tree classifier. Also note that the
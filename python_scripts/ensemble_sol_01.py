@@ -8,7 +8,7 @@
 # a testing set.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
@@ -47,6 +47,7 @@ for param in bagging.get_params().keys():
 # %%
 from scipy.stats import randint
 from sklearn.model_selection import RandomizedSearchCV
+from helpers.smoke import smoke_cap
 
 param_grid = {
     "n_estimators": randint(10, 30),
@@ -54,7 +55,7 @@ param_grid = {
     "max_features": [0.5, 0.8, 1.0],
     "base_estimator__max_depth": randint(3, 10),
 }
-search = RandomizedSearchCV(bagging, param_grid, n_iter=20)
+search = RandomizedSearchCV(bagging, param_grid, n_iter=smoke_cap(20, 2))
 search.fit(X_train, y_train)
 
 # %%
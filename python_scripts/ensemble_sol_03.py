@@ -9,30 +9,42 @@
 # and a testing set.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
+from helpers.sharing import share_data
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 X_train, X_test, y_train, y_test = train_test_split(
     X, y, random_state=0, test_size=0.5
 )
+# store the training set once in shared memory for the parallel workers
+X_train, y_train = share_data(X_train, y_train)
 
 # %% [markdown]
 # Create an `AbaBoostRegressor`. Using the function
 # `sklearn.model_selection.validation_curve` to get training and test scores
 # by varying the value the number of estimators. *Hint: vary the number of
 # estimators between 1 and 60.*
+#
+# `validation_curve` fits a new ensemble for each number of estimators, while
+# an ensemble with fewer estimators is made of the first estimators of a
+# larger one. The function `ensemble_size_validation_curve` of our `helpers`
+# module uses this to fit a single ensemble, with the largest number of
+# estimators, for each cross-validation split: the predictions of the smaller
+# AdaBoost ensembles are given by its `staged_predict` method. It returns the
+# scores with the same layout as `validation_curve`.
 
 # %%
 import numpy as np
 from sklearn.ensemble import AdaBoostRegressor
-from sklearn.model_selection import validation_curve
+from helpers.smoke import smoke_subset
+from helpers.validation import ensemble_size_validation_curve
 
 adaboost = AdaBoostRegressor()
 param_range = np.unique(np.logspace(0, 1.8, num=30).astype(int))
-train_scores, test_scores = validation_curve(
-    adaboost, X_train, y_train, param_name="n_estimators",
-    param_range=param_range, n_jobs=-1)
+param_range = smoke_subset(param_range, 3)
+train_scores, test_scores = ensemble_size_validation_curve(
+    adaboost, X_train, y_train, n_estimators=param_range, n_jobs=-1)
 
 # %% [markdown]
 # Plot both the mean training and test scores. You can as well plot the
@@ -72,14 +84,17 @@ _ = plt.title("Validation curve for AdaBoost regressor")
 
 # %% [markdown]
 # Repeat the experiment using a random forest instead of an AdaBoost regressor.
+#
+# `ensemble_size_validation_curve` also applies to a random forest: the
+# predictions of the smaller forests are the averages of the predictions of
+# the first trees.
 
 # %%
 from sklearn.ensemble import RandomForestRegressor
 
 forest = RandomForestRegressor()
-train_scores, test_scores = validation_curve(
-    adaboost, X_train, y_train, param_name="n_estimators",
-    param_range=param_range, n_jobs=-1)
+train_scores, test_scores = ensemble_size_validation_curve(
+    forest, X_train, y_train, n_estimators=param_range, n_jobs=-1)
 
 # %%
 train_scores_mean = np.mean(train_scores, axis=1)
@@ -11,13 +11,16 @@
 # We will use california housing to conduct our experiments
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
+from helpers.sharing import share_data
 from sklearn.model_selection import train_test_split
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 X_train, X_test, y_train, y_test = train_test_split(
     X, y, random_state=0, test_size=0.5
 )
+# store the training set once in shared memory for the parallel workers
+X_train, y_train = share_data(X_train, y_train)
 
 # %% [markdown]
 # Similarly to the previous exercise, create a gradient boosting decision tree
@@ -27,13 +30,17 @@ X_train, X_test, y_train, y_test = train_test_split(
 # %%
 import numpy as np
 from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.model_selection import validation_curve
+from helpers.smoke import smoke_subset
+from helpers.validation import ensemble_size_validation_curve
 
 gbdt = GradientBoostingRegressor()
 param_range = np.unique(np.logspace(0, 1.8, num=30).astype(int))
-train_scores, test_scores = validation_curve(
-    gbdt, X_train, y_train, param_name="n_estimators",
-    param_range=param_range, n_jobs=-1)
+param_range = smoke_subset(param_range, 3)
+# same as `validation_curve` with `param_name="n_estimators"`, but a single
+# model per split is fitted: the smaller ensembles are evaluated with
+# `staged_predict`
+train_scores, test_scores = ensemble_size_validation_curve(
+    gbdt, X_train, y_train, n_estimators=param_range, n_jobs=-1)
 
 # %%
 import matplotlib.pyplot as plt
@@ -79,7 +86,10 @@ _ = plt.title("Validation curve for GBDT regressor")
 # allow to improve the overall performance.
 
 # %%
-gbdt = GradientBoostingRegressor(n_estimators=1000, n_iter_no_change=5)
+from helpers.smoke import smoke_cap
+
+gbdt = GradientBoostingRegressor(
+    n_estimators=smoke_cap(1000, 10), n_iter_no_change=5)
 gbdt.fit(X_train, y_train)
 gbdt.n_estimators_
 
@@ -9,7 +9,7 @@
 # We will use the california housing dataset.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 
 X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 
@@ -21,9 +21,10 @@ X, y = fetch_california_housing(return_X_y=True, as_frame=True)
 # %%
 from sklearn.experimental import enable_hist_gradient_boosting
 from sklearn.ensemble import HistGradientBoostingRegressor
+from helpers.smoke import smoke_cap
 
 hist_gbdt = HistGradientBoostingRegressor(
-    max_iter=1000, early_stopping=True, random_state=0)
+    max_iter=smoke_cap(1000, 10), early_stopping=True, random_state=0)
 
 # %% [markdown]
 # We will use a grid-search to find some optimal parameter for this model.
@@ -57,10 +58,17 @@ search = GridSearchCV(hist_gbdt, params)
 # %%
 from sklearn.model_selection import cross_validate
 from sklearn.model_selection import KFold
+from helpers.parallel import plan_parallelism
 
 cv = KFold(n_splits=5, shuffle=True, random_state=0)
-results = cross_validate(
-    search, X, y, cv=cv, return_estimator=True, n_jobs=-1)
+# the grid-search and the OpenMP threads of the gradient-boosting are
+# nested in the cross-validation: share the cores between them
+plan = plan_parallelism(search, n_tasks=cv.get_n_splits())
+print(plan)
+with plan:
+    results = cross_validate(
+        plan.estimator, X, y, cv=cv, return_estimator=True,
+        n_jobs=plan.n_jobs)
 
 # %% [markdown]
 # We got the results of the cross-validation. First check what is the mean and
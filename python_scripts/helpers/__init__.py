@@ -0,0 +1,7 @@
+"""
+Utilities shared by the notebooks of the course.
+
+The modules of this package are not meant to be read by learners: they
+gather the plumbing (data loading, plotting, ...) that would otherwise be
+copy-pasted across notebooks.
+"""
@@ -0,0 +1,90 @@
+"""
+Bootstrap samples represented by counts rather than by copies of the data.
+"""
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.utils import check_random_state
+
+
+def bootstrap_counts(n_samples, n_bootstrap, batch_size=None,
+                     random_state=None):
+    """Generate bootstrap samples as the number of draws of each sample.
+
+    The indices of `batch_size` bootstrap samples are drawn at once and
+    counted, such that the memory used does not depend on `n_bootstrap`.
+    A sample drawn `k` times in a bootstrap sample is equivalent to a sample
+    weight of `k`, and the samples not drawn have a count of 0.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of samples of the dataset, and of each bootstrap sample.
+    n_bootstrap : int
+        Number of bootstrap samples.
+    batch_size : int, default=None
+        Number of bootstrap samples drawn at once. By default, as many as
+        fit in about 4 million indices.
+    random_state : int, RandomState instance or None, default=None
+        Controls the draws.
+
+    Yields
+    ------
+    counts : ndarray of shape (n_samples,)
+        Number of times each sample is drawn in a bootstrap sample.
+    """
+    rng = check_random_state(random_state)
+    if batch_size is None:
+        batch_size = max(1, 4_000_000 // n_samples)
+    for start in range(0, n_bootstrap, batch_size):
+        n_batch = min(batch_size, n_bootstrap - start)
+        indices = rng.randint(n_samples, size=(n_batch, n_samples))
+        # shift the indices of each bootstrap sample to count them with a
+        # single call to bincount
+        indices += n_samples * np.arange(n_batch)[:, np.newaxis]
+        counts = np.bincount(indices.ravel(), minlength=n_batch * n_samples)
+        yield from counts.reshape(n_batch, n_samples)
+
+
+def bagging_predict(estimator, X, y, X_test, n_bootstrap=10,
+                    random_state=None):
+    """Fit an estimator on bootstrap samples and average their predictions.
+
+    Each estimator is fitted on the whole dataset with the bootstrap counts
+    as sample weights, as done by `BaggingRegressor` when the estimator
+    supports them, instead of on a copy of the bootstrap sample. Its
+    predictions are added to a running mean and the estimator is discarded:
+    the memory used does not grow with `n_bootstrap`.
+
+    Parameters
+    ----------
+    estimator : estimator
+        A regressor accepting `sample_weight` in its `fit` method.
+    X : array-like of shape (n_samples, n_features)
+        The training data.
+    y : array-like of shape (n_samples,)
+        The training target.
+    X_test : array-like of shape (n_test_samples, n_features)
+        The data to predict.
+    n_bootstrap : int, default=10
+        Number of bootstrap samples, i.e. of estimators averaged.
+    random_state : int, RandomState instance or None, default=None
+        Controls the bootstrap samples.
+
+    Returns
+    -------
+    y_pred : ndarray of shape (n_test_samples,)
+        The averaged predictions.
+    """
+    # convert the data once rather than at each fit; the trees work in
+    # single precision
+    X = np.asarray(X, dtype=np.float32)
+    X_test = np.asarray(X_test, dtype=np.float32)
+    y = np.asarray(y)
+    y_pred = np.zeros(X_test.shape[0])
+    for n_fitted, counts in enumerate(
+            bootstrap_counts(len(y), n_bootstrap, random_state=random_state),
+            start=1):
+        model = clone(estimator).fit(X, y, sample_weight=counts)
+        y_pred += (model.predict(X_test) - y_pred) / n_fitted
+    return y_pred
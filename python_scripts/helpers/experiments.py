@@ -0,0 +1,124 @@
+"""
+Running independent cross-validation experiments concurrently.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+from sklearn.utils import check_random_state
+
+from .sharing import share_data
+
+
+def _subset(X, indices):
+    return X.iloc[indices] if hasattr(X, "iloc") else X[indices]
+
+
+def _fit_and_score_split(estimator, X, y, train, test, scorer,
+                         permutation_seed):
+    if permutation_seed is not None:
+        rng = np.random.RandomState(permutation_seed)
+        y = np.asarray(y)[rng.permutation(len(y))]
+    estimator = clone(estimator)
+    start = time.perf_counter()
+    estimator.fit(_subset(X, train), _subset(y, train))
+    fit_time = time.perf_counter() - start
+    score = scorer(estimator, _subset(X, test), _subset(y, test))
+    score_time = time.perf_counter() - start - fit_time
+    return score, fit_time, score_time
+
+
+def run_experiments(experiments, X, y, cv=None, scoring=None, n_jobs=None,
+                    random_state=None):
+    """Cross-validate several models concurrently on the same data.
+
+    The experiments of a comparison, e.g. a model and its baselines, are
+    independent. Instead of cross-validating them one after the other, the
+    fits of all the experiments, for all the cross-validation splits, are
+    scheduled together on a single pool of `n_jobs` worker processes, to
+    which the data is sent once (see `helpers.sharing`). The comparison then
+    takes about the time of its most expensive experiment rather than the
+    sum of the times of all the experiments.
+
+    Parameters
+    ----------
+    experiments : dict
+        Names of the experiments mapped to either an estimator, or a dict
+        with the key `"estimator"` and optionally the keys `"cv"` and
+        `"scoring"`, overriding the parameters of the same name, and
+        `"n_permutations"`. An experiment with `n_permutations` gives the
+        chance level of the estimator as `permutation_test_score`: the
+        estimator is cross-validated with the target randomly permuted.
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,)
+        The target.
+    cv : int or cross-validation generator, default=None
+        The cross-validation strategy of the experiments, 5-fold by default.
+    scoring : str or callable, default=None
+        The metric of the experiments. By default, the `score` method of
+        each estimator.
+    n_jobs : int, default=None
+        Number of worker processes running the fits.
+    random_state : int, RandomState instance or None, default=None
+        Controls the permutations of the target.
+
+    Returns
+    -------
+    results : dataframe
+        A tidy dataframe with one row per experiment and split, and for the
+        permutation experiments, one row per permutation whose score is the
+        mean over the splits. The columns are `experiment`, `split`,
+        `permutation`, `test_score`, `fit_time` and `score_time`.
+    """
+    rng = check_random_state(random_state)
+    X, y = share_data(X, y)
+
+    tasks = []
+    for name, experiment in experiments.items():
+        if not isinstance(experiment, dict):
+            experiment = {"estimator": experiment}
+        estimator = experiment["estimator"]
+        scorer = check_scoring(
+            estimator, scoring=experiment.get("scoring", scoring))
+        experiment_cv = check_cv(experiment.get("cv", cv), y,
+                                 classifier=is_classifier(estimator))
+        splits = list(experiment_cv.split(X, y))
+        n_permutations = experiment.get("n_permutations")
+        if n_permutations is None:
+            seeds = [None]
+        else:
+            seeds = rng.randint(np.iinfo(np.int32).max, size=n_permutations)
+        for permutation, seed in enumerate(seeds):
+            for split, (train, test) in enumerate(splits):
+                tasks.append((name, split, permutation, estimator, train,
+                              test, scorer, seed))
+
+    out = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score_split)(
+            estimator, X, y, train, test, scorer, seed)
+        for _, _, _, estimator, train, test, scorer, seed in tasks)
+
+    results = pd.DataFrame(
+        [(name, split, permutation if seed is not None else np.nan)
+         for name, split, permutation, _, _, _, _, seed in tasks],
+        columns=["experiment", "split", "permutation"])
+    results[["test_score", "fit_time", "score_time"]] = np.array(out)
+
+    # a permutation is scored by its mean score over the splits
+    permuted = results["permutation"].notna()
+    permutation_results = results[permuted].groupby(
+        ["experiment", "permutation"], sort=False, as_index=False).agg(
+        test_score=("test_score", "mean"), fit_time=("fit_time", "sum"),
+        score_time=("score_time", "sum"))
+    results = pd.concat([results[~permuted], permutation_results],
+                        ignore_index=True)
+    results[["split", "permutation"]] = results[
+        ["split", "permutation"]].astype("Int64")
+    return results[["experiment", "split", "permutation", "test_score",
+                    "fit_time", "score_time"]]
@@ -0,0 +1,105 @@
+"""
+Model inspection utilities.
+"""
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import is_classifier
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.utils import check_random_state
+
+
+def _permutation_scores(model, X, y, columns, feature_indices, seeds,
+                        n_repeats, score_func):
+    """Score the model with each feature of `feature_indices` permuted.
+
+    The data is copied once in a buffer, allocated once for all the
+    features. For each repetition, the column of the current feature is
+    overwritten in place with a permutation and the buffer is predicted. The
+    column is restored before moving to the next feature, such that the
+    memory used does not depend on `n_repeats`.
+    """
+    n_samples = X.shape[0]
+    buffer = np.array(X, dtype=np.float64)
+    if columns is not None:
+        # the model might select the columns by name
+        batch = pd.DataFrame(buffer, columns=columns, copy=False)
+    else:
+        batch = buffer
+
+    scores = np.empty((len(feature_indices), n_repeats))
+    for i, (feature_idx, seed) in enumerate(zip(feature_indices, seeds)):
+        rng = np.random.RandomState(seed)
+        original = buffer[:, feature_idx].copy()
+        for repeat in range(n_repeats):
+            buffer[:, feature_idx] = original[rng.permutation(n_samples)]
+            scores[i, repeat] = score_func(y, model.predict(batch))
+        buffer[:, feature_idx] = original
+    return scores
+
+
+def permutation_importance(model, X, y, n_repeats=10, score_func=None,
+                           n_jobs=None, random_state=None):
+    """Compute the permutation importance of each feature.
+
+    This computes the same quantity as the `permutation_importance` function
+    of `dev_features_importance.py`, but without copying the dataset for each
+    feature and repetition: the baseline score is computed once, the columns
+    are permuted in place in a single copy of the data and the features are
+    spread over `n_jobs` worker processes.
+
+    Parameters
+    ----------
+    model : estimator
+        A fitted model.
+    X : dataframe or ndarray of shape (n_samples, n_features)
+        The data on which to compute the importances. It should only contain
+        numerical features.
+    y : array-like of shape (n_samples,)
+        The target.
+    n_repeats : int, default=10
+        Number of times each feature is permuted.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)` where higher is
+        better. By default, the metric of `model.score`: the accuracy for
+        classifiers and the R2 score for regressors.
+    n_jobs : int, default=None
+        Number of worker processes among which the features are split.
+    random_state : int, RandomState instance or None, default=None
+        Controls the permutations.
+
+    Returns
+    -------
+    result : dict
+        With the keys `importances_mean`, `importances_std` and
+        `importances`, the latter being of shape (n_features, n_repeats).
+    """
+    if score_func is None:
+        score_func = accuracy_score if is_classifier(model) else r2_score
+    columns = X.columns if hasattr(X, "columns") else None
+    # joblib would send a column-major view of a memory-mapped dataframe
+    # (see `helpers.sharing`) to the workers with the wrong layout
+    X_array, y = np.asarray(X, order="C"), np.asarray(y)
+    n_features = X_array.shape[1]
+    rng = check_random_state(random_state)
+    seeds = rng.randint(np.iinfo(np.int32).max, size=n_features)
+
+    baseline_score = score_func(y, model.predict(X))
+
+    # one chunk of features per worker such that each worker allocates a
+    # single buffer; joblib memory-maps the large arrays to share them
+    n_chunks = min(n_features, effective_n_jobs(n_jobs))
+    chunks = np.array_split(np.arange(n_features), n_chunks)
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_permutation_scores)(
+            model, X_array, y, columns, chunk, seeds[chunk], n_repeats,
+            score_func)
+        for chunk in chunks
+    )
+    importances = baseline_score - np.concatenate(scores)
+    return {
+        "importances_mean": np.mean(importances, axis=1),
+        "importances_std": np.std(importances, axis=1),
+        "importances": importances,
+    }
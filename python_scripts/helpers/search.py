@@ -0,0 +1,651 @@
+"""
+Hyperparameter search strategies complementing the ones of scikit-learn.
+"""
+
+import json
+import os
+import time
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.exceptions import FitFailedWarning
+from sklearn.metrics import accuracy_score, check_scoring, r2_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, check_cv
+
+from .validation import (
+    _node_pruning_alphas, _nodes_by_depth, _predict_truncated)
+
+
+def _subset(X, indices):
+    return X.iloc[indices] if hasattr(X, "iloc") else X[indices]
+
+
+def _fit_and_score(estimator, params, X, y, train, test, scorer,
+                   error_score):
+    """Fit a candidate on one split and return its test score and fit time.
+
+    A failing fit is given `error_score`, as in the scikit-learn searches.
+    """
+    estimator = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    try:
+        estimator.fit(_subset(X, train), _subset(y, train))
+    except Exception as exc:
+        if error_score == "raise":
+            raise
+        warnings.warn(f"Fitting failed with the parameters {params}: "
+                      f"{exc!r}", FitFailedWarning)
+        return error_score, time.perf_counter() - start
+    fit_time = time.perf_counter() - start
+    return scorer(estimator, _subset(X, test), _subset(y, test)), fit_time
+
+
+def _to_builtin(value):
+    """Convert the numpy scalars to Python ones, serializable in JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _describe(value):
+    """Describe a parameter space or a scoring, identically across sessions.
+
+    The frozen scipy distributions are described by their name and
+    arguments, the functions by their name and the other objects by their
+    attributes, rather than pickled: their pickles contain random states
+    and memory addresses.
+    """
+    if hasattr(value, "dist") and hasattr(value, "args"):
+        # a frozen scipy.stats distribution
+        return [value.dist.name, _describe(list(value.args)),
+                _describe(value.kwds)]
+    if isinstance(value, dict):
+        return {str(name): _describe(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{value.__module__}.{value.__qualname__}"
+    if hasattr(value, "__dict__"):
+        return [type(value).__qualname__, _describe(vars(value))]
+    return _to_builtin(value)
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True, default=repr)
+
+
+def _fit_and_store(estimator, params, X, y, split, train, test, scorer,
+                   error_score, store):
+    """Fit and score a candidate on one split and append it to the store.
+
+    The record is written in a single `write` call on a file opened in
+    append mode, such that the records of concurrent workers do not
+    interleave.
+    """
+    start = time.perf_counter()
+    score, fit_time = _fit_and_score(
+        estimator, params, X, y, train, test, scorer, error_score)
+    record = {
+        "params": params,
+        "split": split,
+        "test_score": float(score),
+        "fit_time": fit_time,
+        "score_time": time.perf_counter() - start - fit_time,
+    }
+    line = json.dumps(record, default=repr) + "\n"
+    with open(store, "a") as f:
+        f.write(line)
+    return record
+
+
+def _read_store(store):
+    """Read the header and the records of a results store.
+
+    A truncated last line, left by an interrupted write, is ignored.
+    """
+    header, records = None, []
+    with open(store) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if header is None:
+                header = entry
+            else:
+                records.append(entry)
+    return header, records
+
+
+def _format_store_results(records, n_splits=None):
+    """Gather the records of each candidate in a `cv_results_` dict.
+
+    Splits not evaluated yet have a NaN score and are ignored by the mean.
+    """
+    candidates = {}
+    for record in records:
+        key = _params_key(record["params"])
+        candidates.setdefault(key, (record["params"], {}))[1][
+            record["split"]] = record
+    if n_splits is None:
+        n_splits = 1 + max(
+            (record["split"] for record in records), default=-1)
+
+    params = [candidate_params for candidate_params, _ in
+              candidates.values()]
+    splits = [candidate_splits for _, candidate_splits in
+              candidates.values()]
+    scores = np.array([
+        [s[split]["test_score"] if split in s else np.nan
+         for split in range(n_splits)] for s in splits]).reshape(
+            len(params), n_splits)
+
+    cv_results = {
+        "mean_fit_time": np.array(
+            [np.mean([r["fit_time"] for r in s.values()]) for s in splits]),
+        "mean_score_time": np.array(
+            [np.mean([r["score_time"] for r in s.values()]) for s in splits]),
+        "params": params,
+    }
+    for name in sorted({name for p in params for name in p}):
+        values = np.array([p.get(name) for p in params], dtype=object)
+        try:
+            # the numbers are read back from JSON as objects: convert them as
+            # in the `cv_results_` of the scikit-learn searches
+            values = pd.to_numeric(values)
+        except (TypeError, ValueError):
+            pass
+        cv_results[f"param_{name}"] = values
+    for split in range(n_splits):
+        cv_results[f"split{split}_test_score"] = scores[:, split]
+    with warnings.catch_warnings():
+        # candidates whose splits all failed or are not evaluated yet
+        warnings.simplefilter("ignore", RuntimeWarning)
+        cv_results["mean_test_score"] = np.nanmean(scores, axis=1)
+        cv_results["std_test_score"] = np.nanstd(scores, axis=1)
+    cv_results["n_splits_done"] = np.array([len(s) for s in splits])
+    mean_scores = np.nan_to_num(cv_results["mean_test_score"], nan=-np.inf)
+    ranks = np.empty(len(params), dtype=int)
+    ranks[np.argsort(-mean_scores, kind="mergesort")] = np.arange(
+        1, len(params) + 1)
+    cv_results["rank_test_score"] = ranks
+    return cv_results
+
+
+def load_search_results(store):
+    """Load the results of a `ResumableRandomSearch` in a dataframe.
+
+    The store can be read while the search is running, or after it has been
+    interrupted: the candidates only evaluated on some of the splits are
+    reported with the mean score of these splits and their number in the
+    `n_splits_done` column.
+
+    Parameters
+    ----------
+    store : str or Path
+        The results store of the search.
+
+    Returns
+    -------
+    cv_results : dataframe
+        The results with the same columns as the `cv_results_` of the
+        scikit-learn searches, one row per candidate.
+    """
+    header, records = _read_store(store)
+    n_splits = header["n_splits"] if header is not None else None
+    return pd.DataFrame(_format_store_results(records, n_splits))
+
+
+class ResumableRandomSearch:
+    """Random search saving each result as soon as it is computed.
+
+    Each fit of a candidate on a cross-validation split appends its score
+    to the `store` file. When the search is interrupted, e.g. by a kernel
+    restart, fitting it again skips the candidates and splits already
+    present in the store. The results can also be loaded without fitting
+    anything with `load_search_results`.
+
+    Parameters
+    ----------
+    estimator : estimator
+        The model whose parameters are searched.
+    param_distributions : dict
+        Parameter names mapped to the distributions or lists of values from
+        which the candidates are sampled, as in `RandomizedSearchCV`. The
+        sampled values should be numbers or strings to be stored.
+    n_iter : int, default=10
+        Number of candidates.
+    store : str or Path, default="search_results.jsonl"
+        File where the results are appended, one JSON record per line. It
+        can only be reused by a search with the same estimator, parameter
+        space, scoring, data and cross-validation splits.
+    cv : int or cross-validation generator, default=5
+        The cross-validation strategy. It should be deterministic, i.e. not
+        shuffle the data without a fixed `random_state`.
+    scoring : str or callable, default=None
+        The metric used to compare the candidates. By default, the `score`
+        method of `estimator`.
+    n_jobs : int, default=None
+        Number of jobs fitting the candidates in parallel.
+    refit : bool, default=True
+        Whether to refit the best candidate on the whole training set.
+    error_score : "raise" or float, default=np.nan
+        Score given to a candidate whose fit fails.
+    random_state : int, default=0
+        Controls the sampling of the candidates. It must be an integer such
+        that a restarted search samples the same candidates.
+
+    Attributes
+    ----------
+    cv_results_ : dict of arrays
+        The results of the candidates of this search, read from the store.
+    best_params_ : dict
+        Parameters of the best candidate.
+    best_score_ : float
+        Mean cross-validated score of the best candidate.
+    best_estimator_ : estimator
+        The best candidate refitted, if `refit=True`.
+    """
+
+    def __init__(self, estimator, param_distributions, n_iter=10,
+                 store="search_results.jsonl", cv=5, scoring=None,
+                 n_jobs=None, refit=True, error_score=np.nan,
+                 random_state=0):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.store = store
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.refit = refit
+        self.error_score = error_score
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        """Evaluate the candidates missing from the store."""
+        cv = check_cv(self.cv, y, classifier=is_classifier(self.estimator))
+        scorer = check_scoring(self.estimator, scoring=self.scoring)
+        splits = list(cv.split(X, y))
+        candidates = [
+            {name: _to_builtin(value) for name, value in params.items()}
+            for params in ParameterSampler(
+                self.param_distributions, self.n_iter,
+                random_state=self.random_state)]
+
+        # the results are only reused for the same search, data and splits
+        header = {
+            "fingerprint": joblib.hash(
+                (X, y, [test for _, test in splits])),
+            "n_splits": len(splits),
+            "estimator": joblib.hash(clone(self.estimator)),
+            "search": joblib.hash(json.dumps(
+                _describe([self.param_distributions, self.scoring]),
+                sort_keys=True, default=repr)),
+        }
+        store = Path(self.store)
+        records = []
+        if store.exists() and store.stat().st_size > 0:
+            stored_header, records = _read_store(store)
+            if stored_header != header:
+                raise ValueError(
+                    f"{store} holds the results of another search, or of a "
+                    f"search on other data or cross-validation splits: "
+                    f"remove it or use another store")
+            with open(store, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # terminate the line truncated by an interrupted write
+                    f.write(b"\n")
+        else:
+            store.parent.mkdir(parents=True, exist_ok=True)
+            store.write_text(json.dumps(header) + "\n")
+
+        done = {(_params_key(record["params"]), record["split"])
+                for record in records}
+        todo = [(params, split)
+                for params in candidates for split in range(len(splits))
+                if (_params_key(params), split) not in done]
+        new_records = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_and_store)(
+                self.estimator, params, X, y, split, *splits[split],
+                scorer, self.error_score, os.fspath(store))
+            for params, split in todo)
+
+        # keep the results of the candidates of this search only
+        keys = {_params_key(params) for params in candidates}
+        self.cv_results_ = _format_store_results(
+            [record for record in records + new_records
+             if _params_key(record["params"]) in keys], len(splits))
+        self.best_index_ = int(np.argmin(self.cv_results_["rank_test_score"]))
+        self.best_params_ = self.cv_results_["params"][self.best_index_]
+        self.best_score_ = self.cv_results_["mean_test_score"][
+            self.best_index_]
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(
+                **self.best_params_).fit(X, y)
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+    def score(self, X, y):
+        return self.best_estimator_.score(X, y)
+
+
+def _fit_pruning_path(estimator, X, y, train):
+    """Fit a tree on `train` and compute the pruning alpha of its nodes."""
+    tree = clone(estimator).set_params(ccp_alpha=0.)
+    tree.fit(_subset(X, train), _subset(y, train))
+    return tree, _node_pruning_alphas(tree)
+
+
+def _score_pruned_trees(tree, pruning_alphas, X, y, test, ccp_alphas,
+                        score_func):
+    """Score the tree pruned with each value of `ccp_alphas` on `test`.
+
+    The pruned tree predicts a sample with the first node of its decision
+    path which is a leaf for this `ccp_alpha`. Since the pruning alphas
+    never increase along a path, this node is found by counting the nodes
+    of the path which are not pruned. The values of `ccp_alphas` giving the
+    same pruned tree are scored once.
+    """
+    nodes = _nodes_by_depth(tree, _subset(X, test), tree.get_depth())
+    path_alphas = pruning_alphas[nodes]
+    y_true = np.asarray(_subset(y, test))
+    rows = np.arange(len(nodes))
+    internal_alphas = np.sort(pruning_alphas[tree.tree_.children_left != -1])
+    # pruned trees are indexed by the number of internal nodes pruned
+    n_pruned = np.searchsorted(internal_alphas, ccp_alphas, side="right")
+    subtrees, inverse = np.unique(n_pruned, return_inverse=True)
+    scores = []
+    for n in subtrees:
+        ccp_alpha = internal_alphas[n - 1] if n else -np.inf
+        depth = np.sum(path_alphas > ccp_alpha, axis=1)
+        y_pred = _predict_truncated(tree, nodes[rows, depth])
+        scores.append(score_func(y_true, y_pred))
+    # each internal node kept adds one leaf to the root
+    n_leaves = 1 + len(internal_alphas) - n_pruned
+    return np.array(scores)[inverse], n_leaves
+
+
+class CostComplexityPruningSearch:
+    """Search the `ccp_alpha` of a decision tree along its pruning path.
+
+    The minimal cost-complexity pruning of a tree gives a sequence of nested
+    subtrees, from the full tree to its root, each subtree being optimal for
+    a range of values of `ccp_alpha`. Instead of fitting a tree for each
+    candidate value of `ccp_alpha`, a single full tree is fitted on each
+    training set and each of its pruned subtrees is scored on the testing
+    set without refitting. This gives a much denser sweep of the
+    regularization than a grid-search on `max_depth` or
+    `min_samples_leaf`, for the cost of a single fit per split.
+
+    Parameters
+    ----------
+    estimator : DecisionTreeClassifier or DecisionTreeRegressor
+        The tree to prune. Its other parameters are kept.
+    ccp_alphas : array-like, default=None
+        The values of `ccp_alpha` to evaluate. By default, all the values at
+        which a subtree is pruned in any of the trees fitted on the
+        training sets.
+    cv : int or cross-validation generator, default=5
+        The cross-validation strategy.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)` where higher is
+        better. By default, the metric of `estimator.score`: the accuracy for
+        classifiers and the R2 score for regressors.
+    n_jobs : int, default=None
+        Number of jobs fitting the trees in parallel.
+    refit : bool, default=True
+        Whether to refit the best pruned tree on the whole training set.
+
+    Attributes
+    ----------
+    cv_results_ : dict of arrays
+        One entry per value of `ccp_alpha`, with the same keys as the
+        `cv_results_` of `GridSearchCV`, plus the mean number of leaves of
+        the pruned trees, `mean_n_leaves`.
+    best_params_ : dict
+        The best `ccp_alpha`. Among equally good values, the largest one,
+        i.e. the smallest tree, is selected.
+    best_score_ : float
+        Mean cross-validated score of the best `ccp_alpha`.
+    best_estimator_ : estimator
+        The tree pruned with the best `ccp_alpha`, if `refit=True`.
+    """
+
+    def __init__(self, estimator, ccp_alphas=None, cv=5, score_func=None,
+                 n_jobs=None, refit=True):
+        self.estimator = estimator
+        self.ccp_alphas = ccp_alphas
+        self.cv = cv
+        self.score_func = score_func
+        self.n_jobs = n_jobs
+        self.refit = refit
+
+    def fit(self, X, y):
+        """Fit a tree per split and score each of its pruned subtrees."""
+        score_func = self.score_func
+        if score_func is None:
+            score_func = (
+                accuracy_score if is_classifier(self.estimator) else r2_score)
+        cv = check_cv(self.cv, y, classifier=is_classifier(self.estimator))
+        splits = list(cv.split(X, y))
+
+        parallel = Parallel(n_jobs=self.n_jobs)
+        trees = parallel(
+            delayed(_fit_pruning_path)(self.estimator, X, y, train)
+            for train, _ in splits)
+        if self.ccp_alphas is None:
+            ccp_alphas = np.unique(np.concatenate([
+                np.maximum(alphas[np.isfinite(alphas)], 0)
+                for _, alphas in trees] + [[0.]]))
+        else:
+            ccp_alphas = np.sort(np.asarray(self.ccp_alphas, dtype=float))
+        out = parallel(
+            delayed(_score_pruned_trees)(
+                tree, alphas, X, y, test, ccp_alphas, score_func)
+            for (tree, alphas), (_, test) in zip(trees, splits))
+        scores, n_leaves = np.array(out).transpose(1, 2, 0)
+
+        cv_results = {
+            "param_ccp_alpha": ccp_alphas,
+            "params": [{"ccp_alpha": alpha} for alpha in ccp_alphas],
+        }
+        for split in range(len(splits)):
+            cv_results[f"split{split}_test_score"] = scores[:, split]
+        cv_results["mean_test_score"] = scores.mean(axis=1)
+        cv_results["std_test_score"] = scores.std(axis=1)
+        cv_results["mean_n_leaves"] = n_leaves.mean(axis=1)
+        # the best scores first and, among them, the largest alphas
+        order = np.lexsort((-ccp_alphas, -cv_results["mean_test_score"]))
+        ranks = np.empty(len(ccp_alphas), dtype=int)
+        ranks[order] = np.arange(1, len(ccp_alphas) + 1)
+        cv_results["rank_test_score"] = ranks
+        self.cv_results_ = cv_results
+
+        self.best_index_ = int(order[0])
+        self.best_params_ = cv_results["params"][self.best_index_]
+        self.best_score_ = cv_results["mean_test_score"][self.best_index_]
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(
+                **self.best_params_).fit(X, y)
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+    def score(self, X, y):
+        return self.best_estimator_.score(X, y)
+
+
+def _oob_predictions(ensemble):
+    """Out-of-bag predictions of a bagging ensemble fitted with `oob_score`.
+
+    Each training sample is predicted by the estimators which did not see it
+    in their bootstrap sample. Samples which were in all the bootstrap
+    samples have no prediction and are marked by `False` in `mask`.
+    """
+    if is_classifier(ensemble):
+        proba = ensemble.oob_decision_function_
+        mask = np.all(np.isfinite(proba), axis=1) & (proba.sum(axis=1) > 0)
+        y_pred = ensemble.classes_[np.argmax(np.nan_to_num(proba), axis=1)]
+    else:
+        y_pred = ensemble.oob_prediction_
+        mask = np.isfinite(y_pred)
+    return y_pred, mask
+
+
+def _fit_oob_score(estimator, params, X, y, score_func):
+    ensemble = clone(estimator).set_params(
+        bootstrap=True, oob_score=True, **params)
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        # the samples without out-of-bag predictions are left out below
+        warnings.filterwarnings("ignore", message=".*OOB.*")
+        warnings.filterwarnings("ignore", message="invalid value encountered")
+        ensemble.fit(X, y)
+    fit_time = time.perf_counter() - start
+    y_pred, mask = _oob_predictions(ensemble)
+    return score_func(np.asarray(y)[mask], y_pred[mask]), fit_time, ensemble
+
+
+def _fit_oob_score_only(estimator, params, X, y, score_func):
+    # only send the score back from the workers: the fitted ensembles can be
+    # large and only the best one is kept
+    score, fit_time, _ = _fit_oob_score(estimator, params, X, y, score_func)
+    return score, fit_time
+
+
+def oob_score(estimator, X, y, score_func=None):
+    """Estimate the generalization score of a bagging ensemble.
+
+    The ensemble is fitted once on all the data. Each sample is predicted
+    by the estimators whose bootstrap sample did not contain it, i.e. about
+    a third of them, such that these out-of-bag predictions are made on
+    unseen data as in a cross-validation, without fitting the ensemble on
+    each fold and without holding out a test set.
+
+    Parameters
+    ----------
+    estimator : estimator
+        A bagging ensemble, e.g. `BaggingRegressor` or
+        `RandomForestClassifier`. It should have enough estimators, say a
+        few tens, such that each sample is out-of-bag for some of them.
+    X : array-like of shape (n_samples, n_features)
+        The data.
+    y : array-like of shape (n_samples,)
+        The target.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)`. By default,
+        the metric of `estimator.score`: the accuracy for classifiers and the
+        R2 score for regressors.
+
+    Returns
+    -------
+    score : float
+        The out-of-bag score.
+    ensemble : estimator
+        The ensemble fitted on all the data.
+    """
+    if score_func is None:
+        score_func = accuracy_score if is_classifier(estimator) else r2_score
+    score, _, ensemble = _fit_oob_score(estimator, {}, X, y, score_func)
+    return score, ensemble
+
+
+class OOBGridSearch:
+    """Grid-search of a bagging ensemble evaluated with out-of-bag samples.
+
+    Each candidate of `param_grid` is fitted once on all the data and is
+    evaluated with its out-of-bag score (see `oob_score`), instead of being
+    fitted on each fold of a cross-validation. The search thus needs `k`
+    times fewer fits than a `GridSearchCV` with `k` folds. The fitted
+    candidates are discarded as soon as they are scored, and the best one is
+    fitted again on all the data, as with the `refit` of `GridSearchCV`.
+
+    Parameters
+    ----------
+    estimator : estimator
+        A bagging ensemble, e.g. `BaggingRegressor` or
+        `RandomForestClassifier`. With a fixed `random_state`, the refitted
+        best candidate is the ensemble whose score is `best_score_`.
+    param_grid : dict or list of dicts
+        The candidates, as in `GridSearchCV`.
+    score_func : callable, default=None
+        Function with signature `score_func(y_true, y_pred)` where higher is
+        better. By default, the metric of `estimator.score`: the accuracy for
+        classifiers and the R2 score for regressors.
+    n_jobs : int, default=None
+        Number of jobs fitting the candidates in parallel.
+
+    Attributes
+    ----------
+    cv_results_ : dict of arrays
+        One entry per candidate, with the keys `params`, `param_<name>`,
+        `mean_fit_time`, `mean_test_score`, the out-of-bag score, and
+        `rank_test_score`, as in the `cv_results_` of `GridSearchCV`.
+    best_params_ : dict
+        Parameters of the best candidate.
+    best_score_ : float
+        Out-of-bag score of the best candidate.
+    best_estimator_ : estimator
+        The best candidate, fitted on all the data.
+    """
+
+    def __init__(self, estimator, param_grid, score_func=None, n_jobs=None):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.score_func = score_func
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y):
+        """Fit each candidate on `X` and `y` and compute its OOB score."""
+        score_func = self.score_func
+        if score_func is None:
+            score_func = (
+                accuracy_score if is_classifier(self.estimator) else r2_score)
+        params = list(ParameterGrid(self.param_grid))
+        out = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_oob_score_only)(
+                self.estimator, candidate_params, X, y, score_func)
+            for candidate_params in params)
+        scores, fit_times = zip(*out)
+
+        cv_results = {"mean_fit_time": np.array(fit_times), "params": params}
+        param_names = sorted({name for p in params for name in p})
+        for name in param_names:
+            cv_results[f"param_{name}"] = np.array(
+                [p.get(name) for p in params], dtype=object)
+        cv_results["mean_test_score"] = np.array(scores)
+        order = np.argsort(-cv_results["mean_test_score"], kind="mergesort")
+        ranks = np.empty(len(order), dtype=int)
+        ranks[order] = np.arange(1, len(order) + 1)
+        cv_results["rank_test_score"] = ranks
+        self.cv_results_ = cv_results
+
+        self.best_index_ = int(order[0])
+        self.best_params_ = params[self.best_index_]
+        self.best_score_ = scores[self.best_index_]
+        _, _, self.best_estimator_ = _fit_oob_score(
+            self.estimator, self.best_params_, X, y, score_func)
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+    def score(self, X, y):
+        return self.best_estimator_.score(X, y)
@@ -0,0 +1,56 @@
+"""
+Smoke mode to quickly execute all the notebooks.
+
+When the environment variable `SKLEARN_MOOC_SMOKE` is set (to anything but
+`0`), the datasets loaded with `helpers.datasets` are subsampled and the
+computationally expensive settings of the notebooks (number of trees,
+iterations, permutations, cross-validation splits, ...) are capped. The
+results are meaningless but every code path of the notebooks is executed in
+a few seconds, which is enough to check that they run.
+
+The number of samples kept can be set with `SKLEARN_MOOC_SMOKE_N_SAMPLES`.
+"""
+
+import os
+
+import numpy as np
+
+SMOKE = os.environ.get("SKLEARN_MOOC_SMOKE", "0") not in ("", "0")
+SMOKE_N_SAMPLES = int(os.environ.get("SKLEARN_MOOC_SMOKE_N_SAMPLES", 2000))
+
+
+def smoke_cap(value, limit):
+    """Return `value`, or `limit` if smaller and the smoke mode is enabled."""
+    return min(value, limit) if SMOKE else value
+
+
+def smoke_subset(values, n_values):
+    """Return `values`, or `n_values` of them in smoke mode.
+
+    The kept values are evenly spaced, such that the first and last values
+    are always included.
+    """
+    if not SMOKE or len(values) <= n_values:
+        return values
+    indices = np.unique(np.linspace(0, len(values) - 1, n_values).astype(int))
+    if isinstance(values, np.ndarray):
+        return values[indices]
+    return type(values)(values[i] for i in indices)
+
+
+def smoke_subsample(*arrays, random_state=0):
+    """Subsample the rows of the arrays in smoke mode.
+
+    The same rows are kept in each array and their original order is
+    preserved. The index of the dataframes and series is reset. Outside of
+    the smoke mode, the arrays are returned unchanged.
+    """
+    n_samples = len(arrays[0])
+    if SMOKE and n_samples > SMOKE_N_SAMPLES:
+        rng = np.random.RandomState(random_state)
+        indices = np.sort(
+            rng.choice(n_samples, size=SMOKE_N_SAMPLES, replace=False))
+        arrays = tuple(
+            a.iloc[indices].reset_index(drop=True) if hasattr(a, "iloc")
+            else a[indices] for a in arrays)
+    return arrays if len(arrays) > 1 else arrays[0]
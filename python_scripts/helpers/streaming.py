@@ -0,0 +1,172 @@
+"""
+Out-of-core learning from CSV files read by chunks.
+
+The models of this module are fitted with `partial_fit` on one chunk of the
+data at a time, such that the memory used is bounded by the size of a chunk
+rather than by the size of the file.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.preprocessing import StandardScaler
+
+from .datasets import DATASETS_DIR
+from .smoke import SMOKE, SMOKE_N_SAMPLES
+
+# the logistic loss was renamed in scikit-learn 1.1
+_LOG_LOSS = "log_loss" if "log_loss" in SGDClassifier.loss_functions else "log"
+
+
+def iter_csv_chunks(name, target_name="class", chunksize=10_000,
+                    data_home=None):
+    """Read one of the CSV files of the `datasets` folder by chunks.
+
+    Parameters
+    ----------
+    name : str
+        Name of the dataset, with or without the `.csv` extension.
+    target_name : str, default="class"
+        Name of the target column.
+    chunksize : int, default=10_000
+        Number of rows of each chunk.
+    data_home : str or Path, default=None
+        Folder containing the CSV files. By default, the `datasets` folder
+        of the repository.
+
+    Yields
+    ------
+    data : dataframe
+        The features of the rows of the chunk.
+    target : series
+        The target of the rows of the chunk. In smoke mode, only the first
+        rows of the file are read (see `helpers.smoke`).
+    """
+    data_home = DATASETS_DIR if data_home is None else Path(data_home)
+    stem = name[:-len(".csv")] if name.endswith(".csv") else name
+    n_rows = SMOKE_N_SAMPLES if SMOKE else None
+    reader = pd.read_csv(data_home / f"{stem}.csv", chunksize=chunksize,
+                         nrows=n_rows)
+    for chunk in reader:
+        yield chunk.drop(columns=target_name), chunk[target_name]
+
+
+class StreamingClassifier:
+    """Standardization followed by a logistic regression fitted by chunks.
+
+    This is the out-of-core counterpart of
+    `make_pipeline(StandardScaler(), LogisticRegression())`. Each call to
+    `partial_fit` updates the running mean and variance of the scaler with a
+    new chunk, and then does one epoch of stochastic gradient descent of the
+    logistic regression on this chunk, standardized with the moments of all
+    the data seen so far.
+
+    Parameters
+    ----------
+    classes : array-like
+        All the classes of the target, since a chunk might not contain all of
+        them.
+    alpha : float, default=1e-4
+        Strength of the L2 regularization of the logistic regression.
+    random_state : int, RandomState instance or None, default=None
+        Controls the shuffling of the samples of each chunk.
+
+    Attributes
+    ----------
+    scaler_ : StandardScaler
+        The scaler fitted on the chunks seen so far.
+    classifier_ : SGDClassifier
+        The logistic regression fitted on the chunks seen so far.
+    n_samples_seen_ : int
+        Number of samples seen so far.
+    """
+
+    def __init__(self, classes, alpha=1e-4, random_state=None):
+        self.classes = classes
+        self.alpha = alpha
+        self.random_state = random_state
+
+    def partial_fit(self, X, y):
+        """Update the model with the chunk `X` and `y`."""
+        if not hasattr(self, "scaler_"):
+            self.scaler_ = StandardScaler()
+            self.classifier_ = SGDClassifier(
+                loss=_LOG_LOSS, alpha=self.alpha,
+                random_state=self.random_state)
+            self.n_samples_seen_ = 0
+        self.scaler_.partial_fit(X)
+        self.classifier_.partial_fit(
+            self.scaler_.transform(X), y, classes=self.classes)
+        self.n_samples_seen_ += len(y)
+        return self
+
+    def fit(self, chunks):
+        """Fit the model from scratch on an iterable of `(X, y)` chunks."""
+        for attribute in ("scaler_", "classifier_", "n_samples_seen_"):
+            self.__dict__.pop(attribute, None)
+        for X, y in chunks:
+            self.partial_fit(X, y)
+        return self
+
+    def predict(self, X):
+        return self.classifier_.predict(self.scaler_.transform(X))
+
+    def predict_proba(self, X):
+        return self.classifier_.predict_proba(self.scaler_.transform(X))
+
+    def score(self, X, y):
+        return accuracy_score(y, self.predict(X))
+
+
+def score_chunks(model, chunks, score_func=accuracy_score):
+    """Score a fitted model on an iterable of `(X, y)` chunks.
+
+    The score of each chunk is weighted by its number of samples, which
+    gives the score on the whole data for metrics averaging a quantity over
+    the samples, such as the accuracy.
+    """
+    scores, n_samples = [], []
+    for X, y in chunks:
+        scores.append(score_func(y, model.predict(X)))
+        n_samples.append(len(y))
+    return np.average(scores, weights=n_samples)
+
+
+def progressive_validation(model, chunks, score_func=accuracy_score):
+    """Fit a model by chunks, scoring each chunk before learning from it.
+
+    Each chunk is unseen data for the model fitted on the previous chunks:
+    its score estimates the generalization performance of the model at this
+    point of the stream, without holding out data. The first chunk is only
+    used for training.
+
+    Parameters
+    ----------
+    model : estimator
+        A model with a `partial_fit(X, y)` method, e.g. a
+        `StreamingClassifier`.
+    chunks : iterable of tuples
+        The `(X, y)` chunks, e.g. given by `iter_csv_chunks`.
+    score_func : callable, default=accuracy_score
+        Function with signature `score_func(y_true, y_pred)`.
+
+    Returns
+    -------
+    scores : dataframe
+        One row per chunk scored, with the number of samples the model was
+        fitted on, `n_samples_seen`, the number of samples scored,
+        `n_samples`, and the `score`.
+    """
+    records, n_samples_seen = [], 0
+    for X, y in chunks:
+        if n_samples_seen:
+            records.append({
+                "n_samples_seen": n_samples_seen, "n_samples": len(y),
+                "score": score_func(y, model.predict(X))})
+        model.partial_fit(X, y)
+        n_samples_seen += len(y)
+    return pd.DataFrame(
+        records, columns=["n_samples_seen", "n_samples", "score"])
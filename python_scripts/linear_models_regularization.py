@@ -14,7 +14,7 @@
 # We will first load the california housing dataset.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
 X.head()
@@ -296,6 +296,30 @@ plt.xlabel('alpha (regularization strength)')
 plt.ylabel('R2 score (higher is better)')
 _ = plt.legend()
 
+# %% [markdown]
+# For each value of `alpha`, the loop above expands and scales the features
+# again and solves a new linear system. For a ridge model, this can be
+# avoided: once the data are preprocessed, a single singular value
+# decomposition of the training data gives the coefficients for all the
+# values of `alpha`. The function `ridge_path` of our `helpers` module
+# implements this approach. It makes it affordable to explore a much finer
+# grid of values of `alpha`.
+
+# %%
+from helpers.linear_models import ridge_path
+
+preprocessor = ridge[:-1].fit(X_sub_train)
+alphas_fine = np.logspace(-10, -1, num=1000)
+path = ridge_path(
+    preprocessor.transform(X_sub_train), y_sub_train, alphas_fine,
+    preprocessor.transform(X_valid), y_valid)
+
+plt.plot(alphas, list_ridge_scores, "+", label="Ridge")
+plt.plot(alphas_fine, path.valid_scores, label="Ridge path")
+plt.xlabel('alpha (regularization strength)')
+plt.ylabel('R2 score (higher is better)')
+_ = plt.legend()
+
 # %% [markdown]
 # We see that, just like adding salt in cooking, adding regularization in our
 # model could improve its error on the validation set. But too much
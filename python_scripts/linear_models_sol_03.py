@@ -15,7 +15,7 @@
 # house price.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
 X.head()
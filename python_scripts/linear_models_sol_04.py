@@ -17,7 +17,7 @@
 #   normalize the data, and a ridge regression as a linear model.
 
 # %%
-from sklearn.datasets import fetch_california_housing
+from helpers.datasets import fetch_california_housing
 
 X, y = fetch_california_housing(as_frame=True, return_X_y=True)
 X.head()
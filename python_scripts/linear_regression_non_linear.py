@@ -11,38 +11,14 @@
 # to perform classification on some toy-datasets where it is impossible to
 # find a perfect linear separation.
 #
-# First, we redefine our plotting utility to show the decision boundary of a
+# First, we import our plotting utility to show the decision boundary of a
 # classifier.
 
 # %%
 import numpy as np
 import matplotlib.pyplot as plt
 
-
-def plot_decision_function(fitted_classifier, range_features, ax=None):
-    """Plot the boundary of the decision function of a classifier."""
-    from sklearn.preprocessing import LabelEncoder
-
-    feature_names = list(range_features.keys())
-    # create a grid to evaluate all possible samples
-    plot_step = 0.02
-    xx, yy = np.meshgrid(
-        np.arange(*range_features[feature_names[0]], plot_step),
-        np.arange(*range_features[feature_names[1]], plot_step),
-    )
-
-    # compute the associated prediction
-    Z = fitted_classifier.predict(np.c_[xx.ravel(), yy.ravel()])
-    Z = LabelEncoder().fit_transform(Z)
-    Z = Z.reshape(xx.shape)
-
-    # make the plot of the boundary and the data samples
-    if ax is None:
-        _, ax = plt.subplots()
-    ax.contourf(xx, yy, Z, alpha=0.4, cmap="RdBu")
-
-    return ax
-
+from helpers.plotting import plot_decision_function
 
 # %% [markdown]
 # We will generate some synthetic data with special pattern which are known to
@@ -49,7 +49,7 @@ range_features = {
 }
 
 # %% [markdown]
-# To visualize the separation found by our classifier, we will define an helper
+# To visualize the separation found by our classifier, we will use an helper
 # function `plot_decision_function`. In short, this function will plot the edge
 # of the decision function, where the probability to be an Adelie or Chinstrap
 # will be equal (p=0.5).
@@ -58,31 +58,7 @@ range_features = {
 import numpy as np
 import matplotlib.pyplot as plt
 
-
-def plot_decision_function(fitted_classifier, range_features, ax=None):
-    """Plot the boundary of the decision function of a classifier."""
-    from sklearn.preprocessing import LabelEncoder
-
-    feature_names = list(range_features.keys())
-    # create a grid to evaluate all possible samples
-    plot_step = 0.02
-    xx, yy = np.meshgrid(
-        np.arange(*range_features[feature_names[0]], plot_step),
-        np.arange(*range_features[feature_names[1]], plot_step),
-    )
-
-    # compute the associated prediction
-    Z = fitted_classifier.predict(np.c_[xx.ravel(), yy.ravel()])
-    Z = LabelEncoder().fit_transform(Z)
-    Z = Z.reshape(xx.shape)
-
-    # make the plot of the boundary and the data samples
-    if ax is None:
-        _, ax = plt.subplots()
-    ax.contourf(xx, yy, Z, alpha=0.4, cmap="RdBu")
-
-    return ax
-
+from helpers.plotting import plot_decision_function
 
 # %% [markdown]
 # The linear regression that we previously saw will predict a continuous
@@ -31,39 +31,15 @@ range_features = {
 # In a previous notebook, we learnt that a linear classifier will define a
 # linear separation to split classes using a linear combination of the input
 # features. In our 2-dimensional space, it means that a linear classifier will
-# define some oblique lines that best separate our classes. We define a
-# function below that, given a set of data points and a classifier, will plot
-# the decision boundaries learnt by the classifier.
+# define some oblique lines that best separate our classes. We use a helper
+# function, `plot_decision_function`, that, given a set of data points and a
+# classifier, will plot the decision boundaries learnt by the classifier.
 
 # %%
 import numpy as np
 import matplotlib.pyplot as plt
 
-
-def plot_decision_function(fitted_classifier, range_features, ax=None):
-    """Plot the boundary of the decision function of a classifier."""
-    from sklearn.preprocessing import LabelEncoder
-
-    feature_names = list(range_features.keys())
-    # create a grid to evaluate all possible samples
-    plot_step = 0.02
-    xx, yy = np.meshgrid(
-        np.arange(*range_features[feature_names[0]], plot_step),
-        np.arange(*range_features[feature_names[1]], plot_step),
-    )
-
-    # compute the associated prediction
-    Z = fitted_classifier.predict(np.c_[xx.ravel(), yy.ravel()])
-    Z = LabelEncoder().fit_transform(Z)
-    Z = Z.reshape(xx.shape)
-
-    # make the plot of the boundary and the data samples
-    if ax is None:
-        _, ax = plt.subplots()
-    ax.contourf(xx, yy, Z, alpha=0.4, cmap="RdBu")
-
-    return ax
-
+from helpers.plotting import plot_decision_function
 
 # %% [markdown]
 # Thus, for a linear classifier, we will obtain the following decision
@@ -35,32 +35,18 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 sns.set_context("talk")
 
+from helpers.plotting import plot_decision_function
+
 
 def plot_classification(model, X, y, ax=None):
-    from sklearn.preprocessing import LabelEncoder
     model.fit(X, y)
 
     range_features = {
         feature_name: (X[feature_name].min() - 1, X[feature_name].max() + 1)
         for feature_name in X.columns
     }
-    feature_names = list(range_features.keys())
-    # create a grid to evaluate all possible samples
-    plot_step = 0.02
-    xx, yy = np.meshgrid(
-        np.arange(*range_features[feature_names[0]], plot_step),
-        np.arange(*range_features[feature_names[1]], plot_step),
-    )
-
-    # compute the associated prediction
-    Z = model.predict(np.c_[xx.ravel(), yy.ravel()])
-    Z = LabelEncoder().fit_transform(Z)
-    Z = Z.reshape(xx.shape)
-
     # make the plot of the boundary and the data samples
-    if ax is None:
-        _, ax = plt.subplots()
-    ax.contourf(xx, yy, Z, alpha=0.4, cmap="RdBu")
+    ax = plot_decision_function(model, range_features, ax=ax)
     sns.scatterplot(
         x=data_clf_columns[0], y=data_clf_columns[1], hue=target_clf_column,
         data=data_clf, ax=axs[0], palette=["tab:red", "tab:blue", "black"])
@@ -161,6 +147,52 @@ axs[1].set_title(
 )
 plt.subplots_adjust(wspace=0.3)
 
+# %% [markdown]
+# The grid-search above fits a tree for each depth and each cross-validation
+# split. Another way to regularize a tree is to grow it fully and then to
+# prune it: the minimal cost-complexity pruning removes the branches which
+# decrease the least the impurity per leaf, the trade-off being controlled by
+# the `ccp_alpha` parameter. Increasing `ccp_alpha` gives a sequence of nested
+# subtrees, from the fully grown tree down to its root.
+#
+# Thus, a single tree per cross-validation split is enough to evaluate all
+# the values of `ccp_alpha`: each subtree of its pruning path is scored on the
+# testing set without being refitted. The helper `CostComplexityPruningSearch`
+# implements this search and, as `GridSearchCV`, refits the best pruned tree
+# on the whole dataset.
+
+# %%
+from helpers.search import CostComplexityPruningSearch
+
+tree_clf = CostComplexityPruningSearch(DecisionTreeClassifier(random_state=0))
+tree_reg = CostComplexityPruningSearch(DecisionTreeRegressor(random_state=0))
+
+fig, axs = plt.subplots(ncols=2, figsize=(12, 5))
+plot_classification(
+    tree_clf, data_clf[data_clf_columns], data_clf[target_clf_column],
+    ax=axs[0]
+)
+plot_regression(
+    tree_reg, data_reg[data_reg_columns], data_reg[target_reg_column],
+    ax=axs[1])
+for ax, search in zip(axs, [tree_clf, tree_reg]):
+    ax.set_title(
+        f"ccp_alpha={search.best_params_['ccp_alpha']:.3g}: "
+        f"{search.best_estimator_.get_n_leaves()} leaves"
+    )
+plt.subplots_adjust(wspace=0.3)
+
+# %% [markdown]
+# The results of the search can be inspected as the ones of `GridSearchCV`.
+# Each value of `ccp_alpha` comes with the mean number of leaves of the pruned
+# trees.
+
+# %%
+cv_results = pd.DataFrame(tree_clf.cv_results_)
+cv_results[[
+    "param_ccp_alpha", "mean_n_leaves", "mean_test_score", "std_test_score",
+    "rank_test_score"]].sort_values("rank_test_score").head()
+
 # %% [markdown]
 # The other parameters are used to fine tune the decision tree and have less
 # impact than `max_depth`.